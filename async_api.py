@@ -0,0 +1,111 @@
+"""
+Async API for embedding MLBStatFinder in asyncio services. Every coroutine
+returns the typed models from models.py and nothing is printed.
+
+    async with AsyncMLBClient() as mlb:
+        box = await mlb.box_score("20250601_NYY@BOS")
+        games, log = await asyncio.gather(mlb.scoreboard("20250601"), mlb.game_log("592450"))
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from player_index import PlayerNotFound
+from util_methods import (
+    DEFAULT_SEASON,
+    fetch_box_score,
+    fetch_scoreboard,
+    fetch_matchup,
+    fetch_game_log,
+    get_player_index
+)
+
+# Blocking API calls allowed in flight at once, matches the client's connection pool
+ASYNC_MAX_CONCURRENCY = int(os.getenv('ASYNC_MAX_CONCURRENCY', '16'))
+
+# Seconds a coroutine waits for its answer before raising TimeoutError
+ASYNC_TIMEOUT = float(os.getenv('ASYNC_TIMEOUT', '30'))
+
+
+class AsyncMLBClient:
+    """
+    Coroutine front end over the same Tank01 client, response cache, roster
+    cache and warehouse the rest of the app uses. Blocking fetches run on a
+    bounded thread pool, so any number of queries can be awaited at once while
+    at most max_concurrency hit the network. Identical queries in flight at the
+    same time share one fetch.
+
+    Cancelling or timing out a coroutine releases the caller straight away. The
+    fetch underneath can't be interrupted mid-request; it finishes in the
+    background and its answer is still cached.
+    """
+
+    def __init__(self, max_concurrency=ASYNC_MAX_CONCURRENCY, timeout=ASYNC_TIMEOUT):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="mlb-async")
+        self._inflight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Stop accepting work; fetches already running are left to finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _call(self, key, func, *args, timeout=None):
+        task = self._inflight.get(key)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(loop.run_in_executor(self._executor, func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller giving up mustn't cancel the fetch for everyone else waiting on it
+        return await asyncio.wait_for(asyncio.shield(task), timeout or self.timeout)
+
+    # ----- QUERIES ------------------
+
+    async def box_score(self, game_id, timeout=None):
+        """BoxScore for a game ID (YYYYMMDD_AWAY@HOME), or None if there isn't one."""
+        return await self._call(('box_score', game_id), fetch_box_score, game_id, timeout=timeout)
+
+    async def scoreboard(self, date, timeout=None):
+        """List of ScoreboardGame for a date (YYYYMMDD)."""
+        return await self._call(('scoreboard', date), fetch_scoreboard, date, timeout=timeout)
+
+    async def players(self, name=None, team=None, timeout=None):
+        """
+        RosterPlayers matching a name exactly, on a team, or the whole active
+        roster when neither is given. An unknown name raises PlayerNotFound,
+        whose `suggestions` hold the closest names.
+        """
+        index = await self._call(('roster',), get_player_index, timeout=timeout)
+        if name:
+            players = index.find_all(name)
+            if not players:
+                raise PlayerNotFound(name, index.suggest(name))
+            return players
+        if team:
+            return index.by_team(team)
+        return list(index.players)
+
+    async def matchups(self, pitcher_id, batter_ids, timeout=None):
+        """
+        {batter_id: BattingLine} of each batter's history against the pitcher. A
+        batter who never faced him gets an empty BattingLine, None means the
+        request failed.
+        """
+        batter_ids = list(dict.fromkeys(batter_ids))
+        results = await asyncio.gather(*(
+            self._call(('matchup', pitcher_id, batter_id), fetch_matchup, pitcher_id, batter_id, timeout=timeout)
+            for batter_id in batter_ids
+        ))
+        return dict(zip(batter_ids, results))
+
+    async def game_log(self, player_id, num_games=10, season=None, timeout=None):
+        """A player's last num_games games as GameLogEntry models, newest first."""
+        season = season or DEFAULT_SEASON
+        return await self._call(('game_log', player_id, num_games, season),
+                                fetch_game_log, player_id, num_games, season, timeout=timeout)
@@ -0,0 +1,350 @@
+"""
+Offline benchmarks for the main features. Tank01 calls are answered by the
+replay adapter (recorded fixtures, or a synthetic data set) so nothing here
+touches the paid API.
+
+    python bench.py                         # synthetic data, no latency
+    python bench.py --latency 0.15 --rate-limit-every 20
+    python bench.py --record fixtures/ --scenario scenario.json   # uses the live API once
+    python bench.py --fixtures fixtures/ --scenario scenario.json
+    python bench.py --save baseline.json
+    python bench.py --compare baseline.json # exit 1 on a regression
+    python bench.py --startup               # exit 1 if the menu is slow to start
+"""
+import argparse
+import ast
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from rich.console import Console
+from rich.table import Table
+
+import replay
+import util_methods
+from response_cache import make_key
+from tank01_client import get_client
+from team_data import TEAMS
+
+BENCH_DATE = "20250601"
+
+# Importing everything the menu needs has to stay under this, see --startup
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '250'))
+
+# Modules that should only load once the API is first used, not at startup
+DEFERRED_MODULES = ('requests', 'urllib3', 'dotenv', 'tank01_client')
+
+
+def _stat_block(rng, keys):
+    return {key: str(rng.randint(0, 4)) for key in keys}
+
+
+def synthetic_fixtures(players_per_team=50, seed=7):
+    """
+    Build a realistic sized fake data set: a full player list, one day's
+    scoreboard, every box score on it, a game log and one pitcher's matchups.
+    Returns (fixtures, scenario) where scenario names the things to query.
+    """
+    rng = random.Random(seed)
+    fixtures = {}
+
+    def add(endpoint, params, body):
+        fixtures[make_key(endpoint, params)] = json.dumps({"statusCode": 200, "body": body},
+                                                          separators=(',', ':')).encode('utf-8')
+
+    roster = []
+    for team in TEAMS:
+        for i in range(players_per_team):
+            roster.append({
+                "playerID": f"{team}{i:03d}",
+                "longName": f"{team.title()} Player{i:03d}",
+                "team": team,
+                "pos": "P" if i < 20 else "CF"
+            })
+    add("getMLBPlayerList", {}, roster)
+
+    games = {}
+    for home, away in zip(TEAMS[::2], TEAMS[1::2]):
+        game_id = f"{BENCH_DATE}_{away}@{home}"
+        games[game_id] = {
+            "away": away, "home": home, "gameStatusCode": "2",
+            "lineScore": {"away": {"R": str(rng.randint(0, 9))}, "home": {"R": str(rng.randint(0, 9))}},
+            "probableStartingPitchers": {"away": f"{away}000", "home": f"{home}000"}
+        }
+        hitting = ["AB", "H", "R", "RBI", "BB", "SO", "HR", "2B", "3B"]
+        add("getMLBBoxScore", util_methods.box_score_query(game_id), {
+            "gameID": game_id, "away": away, "home": home, "gameStatusCode": "2",
+            "Venue": "Bench Park", "Attendance": "30000",
+            "lineScore": {
+                side: {"R": "3", "H": "7", "E": "0",
+                       "scoresByInning": {str(i): str(rng.randint(0, 2)) for i in range(1, 10)}}
+                for side in ("away", "home")
+            },
+            "teamStats": {
+                side: {"Hitting": _stat_block(rng, hitting), "Pitching": {"IP": "9.0", **_stat_block(rng, ["H", "ER"])}}
+                for side in ("away", "home")
+            },
+            "startingLineups": {
+                side: [{"playerID": f"{team}{i:03d}", "battingOrder": str(i - 19)} for i in range(20, 29)]
+                for side, team in (("away", away), ("home", home))
+            },
+            "playerStats": [
+                {"playerID": f"{team}{i:03d}", "team": team, "Hitting": _stat_block(rng, hitting),
+                 "fantasyPoints": str(rng.randint(0, 20))}
+                for team in (away, home) for i in range(20, 29)
+            ]
+        })
+    add("getMLBScoresOnly", util_methods.scoreboard_query(BENCH_DATE), games)
+
+    pitcher = roster[0]
+    opposing_team = "BOS"
+    for batter in roster:
+        if batter["team"] == opposing_team:
+            add("getMLBBatterVsPitcher",
+                {"playerID": pitcher["playerID"], "playerRole": "", "opponent": batter["playerID"]},
+                {"opponents": [{"stats": _stat_block(rng, ["AB", "H", "2B", "3B", "HR", "RBI", "BB", "K"])}]})
+
+    hitter = roster[25]
+    add("getMLBGamesForPlayer", {"playerID": hitter["playerID"], "numberOfGames": "10",
+                                 "season": util_methods.DEFAULT_SEASON}, {
+        f"202505{day:02d}_{hitter['team']}@NYY": {"team": hitter["team"], "startingPosition": "CF",
+                                                  "Hitting": _stat_block(rng, ["AB", "H", "R", "RBI", "BB", "SO", "HR"])}
+        for day in range(1, 11)
+    })
+
+    scenario = {
+        "game_id": next(iter(games)),
+        "date": BENCH_DATE,
+        "player_name": hitter["longName"],
+        "player_id": hitter["playerID"],
+        "pitcher_name": pitcher["longName"],
+        "opposing_team": opposing_team
+    }
+    return fixtures, scenario
+
+
+def features(scenario):
+    return {
+        "box_score": lambda: util_methods.get_box_score(scenario["game_id"]),
+        "scoreboard": lambda: util_methods.get_daily_scoreboard(scenario["date"]),
+        "player_lookup": lambda: util_methods.get_active_players(scenario["player_name"]),
+        "pitcher_matchups": lambda: util_methods.get_pitcher_matchups(scenario["pitcher_name"], scenario["opposing_team"]),
+        "player_stats": lambda: util_methods.get_player_stats(scenario["player_id"], 10)
+    }
+
+
+def reset_caches():
+    util_methods.RESPONSE_CACHE.clear()
+    shutil.rmtree(util_methods.RESPONSE_CACHE.directory, ignore_errors=True)
+    util_methods.ROSTER_CACHE.invalidate()
+    util_methods._PLAYER_INDEX = None
+
+
+def measure(func, adapter):
+    """Run func once, returning wall time, API calls, bytes and peak traced memory."""
+    calls_before, bytes_before = adapter.calls, adapter.bytes_sent
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ms": round(elapsed * 1000, 2),
+        "calls": adapter.calls - calls_before,
+        "kb": round((adapter.bytes_sent - bytes_before) / 1024, 1),
+        "peak_mb": round(peak / (1024 * 1024), 2)
+    }
+
+
+def run(fixtures, scenario, latency=0.0, jitter=0.0, rate_limit_every=0, repeat=3):
+    """Benchmark every feature cold (empty caches) and warm (second call). Returns {feature: results}."""
+    adapter = replay.install(get_client(), replay.ReplayAdapter(
+        fixtures, latency=latency, jitter=jitter, rate_limit_every=rate_limit_every))
+
+    results = {}
+    for name, func in features(scenario).items():
+        cold_runs, warm_runs = [], []
+        for _ in range(repeat):
+            reset_caches()
+            cold_runs.append(measure(func, adapter))
+            warm_runs.append(measure(func, adapter))
+        best_cold = min(cold_runs, key=lambda r: r["ms"])
+        best_warm = min(warm_runs, key=lambda r: r["ms"])
+        results[name] = {"cold": best_cold, "warm": best_warm}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """List of regression messages: slower than baseline * (1 + tolerance) or more API calls."""
+    problems = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for phase in ("cold", "warm"):
+            now, before = result[phase], baseline[name][phase]
+            # Ignore noise on very fast paths
+            if now["ms"] > max(before["ms"] * (1 + tolerance), before["ms"] + 5):
+                problems.append(f"{name} ({phase}): {now['ms']} ms vs {before['ms']} ms")
+            if now["calls"] > before["calls"]:
+                problems.append(f"{name} ({phase}): {now['calls']} API calls vs {before['calls']}")
+    return problems
+
+
+def print_results(results, console):
+    table = Table(title="Benchmark (best of runs)")
+    table.add_column("Feature", style="cyan")
+    for phase in ("Cold", "Warm"):
+        table.add_column(f"{phase} ms", justify="right")
+        table.add_column(f"{phase} calls", justify="right")
+        table.add_column(f"{phase} KB", justify="right")
+        table.add_column(f"{phase} peak MB", justify="right")
+    for name, result in results.items():
+        row = [name]
+        for phase in ("cold", "warm"):
+            r = result[phase]
+            row += [str(r["ms"]), str(r["calls"]), str(r["kb"]), str(r["peak_mb"])]
+        table.add_row(*row)
+    console.print(table)
+
+
+def menu_modules():
+    """The modules main.py imports before it shows the menu (its top level imports)."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def measure_startup(repeat=5):
+    """
+    Import the menu's modules in a fresh interpreter `repeat` times. Returns the
+    best import time in ms and which DEFERRED_MODULES got loaded anyway.
+    """
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {', '.join(menu_modules())}\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"print(json.dumps([elapsed, [m for m in {DEFERRED_MODULES!r} if m in sys.modules]]))\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    best, loaded = None, []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script], cwd=here, capture_output=True,
+                                text=True, check=True).stdout
+        elapsed, loaded = json.loads(output.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1), loaded
+
+
+def check_startup(console, repeat=5, budget=STARTUP_BUDGET_MS):
+    """Print the startup time and return 1 if it's over budget or loads something it should defer."""
+    elapsed, loaded = measure_startup(repeat)
+    console.print(f"Menu startup imports: {elapsed} ms (budget {budget:g} ms)")
+    problems = []
+    if elapsed > budget:
+        problems.append(f"startup took {elapsed} ms, over the {budget:g} ms budget")
+    if loaded:
+        problems.append(f"startup imported {', '.join(loaded)}, these should load on first API call")
+    for problem in problems:
+        console.print(f"[red]Regression: {problem}[/red]")
+    return 1 if problems else 0
+
+
+def record(directory, scenario):
+    """Run every feature once against the live API, saving each response as a fixture."""
+    replay.install(get_client(), replay.RecordingAdapter(directory))
+    for func in features(scenario).values():
+        reset_caches()
+        func()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against recorded or synthetic Tank01 payloads")
+    parser.add_argument('--fixtures', help="directory of recorded fixtures (default: synthetic data)")
+    parser.add_argument('--record', help="record live API responses for the scenario into this directory")
+    parser.add_argument('--scenario', help="JSON file with game_id, date, player_name, player_id, "
+                                           "pitcher_name and opposing_team (needed with --fixtures/--record)")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every API call")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra seconds per call")
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="answer every Nth call with a 429")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help="write results as JSON")
+    parser.add_argument('--compare', help="baseline JSON to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--startup', action='store_true',
+                        help="only measure how long the menu takes to import (STARTUP_BUDGET_MS)")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        return check_startup(Console(), max(1, args.repeat))
+
+    # Keep the benchmark away from the real on-disk caches and warehouse
+    workdir = tempfile.mkdtemp(prefix="mlb-bench-")
+    util_methods.ROSTER_CACHE.path = os.path.join(workdir, 'roster.json.gz')
+    util_methods.RESPONSE_CACHE.directory = os.path.join(workdir, 'responses')
+    util_methods.WAREHOUSE.path = os.path.join(workdir, 'warehouse.sqlite')
+
+    # Don't let the client's throttling/backoff dominate the numbers
+    client = get_client()
+    client.limiter.rate = client.limiter.default_rate = 1000.0
+    client.limiter.capacity = client.limiter.tokens = 1000.0
+    client.backoff = 0.01
+
+    # Replayed calls cost nothing, keep them off the real monthly quota
+    client.quota = None
+    util_methods.RESPONSE_CACHE.quota = None
+
+    if args.record or args.fixtures:
+        if not args.scenario:
+            parser.error("--scenario is required with --fixtures or --record")
+        with open(args.scenario) as f:
+            scenario = json.load(f)
+
+    if args.record:
+        util_methods.console.file = io.StringIO()
+        record(args.record, scenario)
+        print(f"Recorded fixtures into {args.record}")
+        return 0
+
+    if args.fixtures:
+        fixtures = replay.load_fixtures(args.fixtures)
+    else:
+        fixtures, scenario = synthetic_fixtures()
+
+    # Render into memory, terminal output speed isn't what's being measured
+    report_console = Console()
+    util_methods.console.file = io.StringIO()
+
+    results = run(fixtures, scenario, args.latency, args.jitter, args.rate_limit_every, args.repeat)
+    print_results(results, report_console)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        for problem in problems:
+            report_console.print(f"[red]Regression: {problem}[/red]")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+How many API calls a menu action is likely to make, worked out from what is
+already cached before anything gets fetched. The menu uses it to confirm
+expensive actions and to warn when the monthly quota can't cover one.
+"""
+import os
+
+from game_log import season_query
+from response_cache import make_key
+from slate import build_slate
+from util_methods import (
+    DEFAULT_SEASON,
+    RESPONSE_CACHE,
+    ROSTER_CACHE,
+    WAREHOUSE,
+    box_score_query,
+    fetch_scoreboard,
+    get_player_index,
+    matchup_query,
+    scoreboard_query
+)
+
+# Actions expected to use at least this many calls ask before running
+QUOTA_CONFIRM_CALLS = int(os.getenv('QUOTA_CONFIRM_CALLS', '20'))
+
+# Guesses for what can't be counted until the data is fetched
+TEAM_ROSTER_SIZE = 26
+LINEUP_SIZE = 9
+GAMES_PER_DAY = 15
+
+
+def _call_cost(endpoint, params):
+    """0 if the response cache would answer, otherwise 1."""
+    return 0 if RESPONSE_CACHE.contains(make_key(endpoint, params)) else 1
+
+
+def _roster_cost():
+    return 0 if ROSTER_CACHE.players is not None or os.path.exists(ROSTER_CACHE.path) else 1
+
+
+def box_score_cost(game_id):
+    if WAREHOUSE.has_game(game_id):
+        return 0
+    return _call_cost("getMLBBoxScore", box_score_query(game_id))
+
+
+def scoreboard_cost(date):
+    if WAREHOUSE.is_date_ingested(date):
+        return 0
+    return _call_cost("getMLBScoresOnly", scoreboard_query(date))
+
+
+def player_lookup_cost(player_name=None):
+    return _roster_cost()
+
+
+def pitcher_matchups_cost(pitcher_name, opposing_team):
+    if _roster_cost():
+        return 1 + TEAM_ROSTER_SIZE
+    index = get_player_index()
+    pitcher = index.find(pitcher_name)
+    if pitcher is None:
+        return 0
+    return sum(_call_cost("getMLBBatterVsPitcher", matchup_query(pitcher.player_id, batter.player_id))
+               for batter in index.by_team(opposing_team) if batter.player_id != pitcher.player_id)
+
+
+def slate_cost(date, *args):
+    upfront = scoreboard_cost(date) + _roster_cost()
+    if upfront:
+        # Nothing to count yet, assume a full day of games
+        return upfront + GAMES_PER_DAY * (1 + 2 * LINEUP_SIZE)
+
+    games = fetch_scoreboard(date)  # cached, so free
+    box_scores = sum(box_score_cost(game.game_id) for game in games)
+    if box_scores:
+        return box_scores + len(games) * 2 * LINEUP_SIZE
+
+    # Scoreboard, roster and box scores are all cached, so the sides can be worked out for free
+    return sum(_call_cost("getMLBBatterVsPitcher", matchup_query(pitcher_id, batter_id))
+               for _, pitcher_id, _, _, batters in build_slate(date) for batter_id in batters)
+
+
+def fantasy_slate_cost(date, *args):
+    if WAREHOUSE.is_date_ingested(date):
+        return 0
+    upfront = scoreboard_cost(date)
+    if upfront:
+        return upfront + GAMES_PER_DAY
+    return sum(box_score_cost(game.game_id) for game in fetch_scoreboard(date) if game.is_live or game.is_final)
+
+
+def player_stats_cost(player_id, num_games):
+    return 0 if WAREHOUSE.is_current() else 1
+
+
+def season_stats_cost(player_id, seasons=None, *args):
+    return sum(_call_cost("getMLBGamesForPlayer", season_query(player_id, season))
+               for season in seasons or [DEFAULT_SEASON])
+
+
+# Menu action name (as passed to run_action) -> estimator taking the action's arguments
+ESTIMATORS = {
+    'box_score': box_score_cost,
+    'scoreboard': scoreboard_cost,
+    'player_lookup': player_lookup_cost,
+    'pitcher_matchups': pitcher_matchups_cost,
+    'slate': slate_cost,
+    'fantasy_slate': fantasy_slate_cost,
+    'player_stats': player_stats_cost,
+    'season_stats': season_stats_cost
+}
+
+
+def estimate_calls(action, *args):
+    """Likely API calls for a menu action, 0 for actions that only read local data."""
+    estimator = ESTIMATORS.get(action)
+    if estimator is None:
+        return 0
+    # An estimate is only advice, it must never stop the action itself
+    try:
+        return estimator(*args)
+    except Exception:
+        return 0
@@ -0,0 +1,397 @@
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields, is_dataclass
+
+from rich.console import Console
+
+from fantasy import fantasy_leaders, load_scoring, slate_points
+from game_log import fetch_game_log_frames
+from ingest import ingest_dates
+from leaderboard import LEADER_STATS, date_range, leaders
+from slate import slate_matchups, rank_matchups
+from models import BattingLine, BoxScore, format_avg
+from profiler import PROFILER, parse_profile_args
+from quota import QUOTA
+from snapshot import export_snapshot, go_offline, parse_snapshot_args, save_recording, snapshot_info, start_recording
+from util_methods import (
+    DEFAULT_SEASON,
+    fetch_box_score,
+    fetch_scoreboard,
+    fetch_game_log,
+    fetch_batter_vs_pitcher,
+    get_player_index
+)
+
+
+def flatten(record, prefix=''):
+    """
+    Flatten nested dicts into dotted keys for CSV output. Tuples of plain
+    values (lineups) become one space separated cell, lists are dropped.
+    """
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, tuple):
+            if not any(isinstance(item, (dict, list, tuple)) for item in value):
+                flat[name] = ' '.join(str(item) for item in value)
+        elif not isinstance(value, list):
+            flat[name] = value
+    return flat
+
+
+def empty_record(cls):
+    """Every field of dataclass `cls` set to None (nested dataclasses spelled out too)."""
+    return {f.name: empty_record(f.type) if is_dataclass(f.type) else None for f in fields(cls)}
+
+
+def complete_record(record, cls):
+    """
+    asdict() output of a `cls` with every nested dataclass that was None
+    replaced by empty_record, so every record of a command has the same keys.
+    """
+    for f in fields(cls):
+        if is_dataclass(f.type):
+            value = record.get(f.name)
+            record[f.name] = empty_record(f.type) if value is None else complete_record(value, f.type)
+    return record
+
+
+class RecordWriter:
+    """
+    Streams records to stdout as JSON Lines or CSV. The CSV header is taken from
+    the first record, so commands give every record the same keys (None for
+    anything missing, see empty_record).
+    """
+
+    def __init__(self, fmt, out=sys.stdout):
+        self.fmt = fmt
+        self.out = out
+        self._csv = None
+
+    def write(self, record):
+        if self.fmt == 'jsonl':
+            self.out.write(json.dumps(record, separators=(',', ':')) + '\n')
+        else:
+            row = flatten(record)
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.out, fieldnames=list(row), extrasaction='ignore')
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        self.out.flush()
+
+
+def run_batch(func, items, workers):
+    """
+    Run func over items on a thread pool and yield (item, result, error) in input
+    order, as soon as each one (and everything before it) is done.
+    """
+    def safe(item):
+        try:
+            return item, func(item), None
+        except Exception as e:
+            return item, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        yield from executor.map(safe, items)
+
+
+def boxscore_records(args):
+    for game_id, box, error in run_batch(fetch_box_score, args.game_ids, args.workers):
+        if error or box is None:
+            yield game_id, None, error or "no box score found"
+            continue
+        record = complete_record(asdict(box), BoxScore)
+        if args.no_players:
+            record.pop('players')
+        yield game_id, [record], None
+
+
+def scoreboard_records(args):
+    for date, games, error in run_batch(fetch_scoreboard, args.dates, args.workers):
+        if error:
+            yield date, None, error
+            continue
+        yield date, [dict(date=date, **asdict(game)) for game in games], None
+
+
+def player_records(args):
+    index = get_player_index()
+
+    def fetch(name):
+        player = index.find(name)
+        if player is None:
+            suggestions = ', '.join(p.name for p in index.suggest(name))
+            raise LookupError("player not found" + (f" (did you mean: {suggestions})" if suggestions else ''))
+        return player, fetch_game_log(player.player_id, args.games, args.season)
+
+    for name, result, error in run_batch(fetch, args.names, args.workers):
+        if error:
+            yield name, None, error
+            continue
+        player, games = result
+        yield name, [dict(player_id=player.player_id, player=player.name, **asdict(game)) for game in games], None
+
+
+def gamelog_records(args):
+    index = get_player_index()
+    players = {}
+    for name in args.names:
+        player = index.find(name)
+        if player is None:
+            yield name, None, "player not found"
+        else:
+            players[player.player_id] = player
+
+    frames = fetch_game_log_frames(players, args.seasons, args.start, args.end, max_workers=args.workers)
+    for player_id, frame in frames.items():
+        cumulative = frame.cumulative()
+        rolling = frame.rolling(args.window)
+        records = []
+        for i in range(len(frame)):
+            record = dict(player_id=player_id, player=players[player_id].name,
+                          game_id=frame.game_ids[i], date=frame.dates[i], team=frame.teams[i])
+            record.update({stat: column[i] for stat, column in frame.columns.items()})
+            record.update({f"cum_{rate.lower()}": format_avg(values[i]) for rate, values in cumulative.items()})
+            record.update({f"roll_{rate.lower()}": format_avg(values[i]) for rate, values in rolling.items()})
+            records.append(record)
+        yield players[player_id].name, records, None
+
+
+def slate_records(args):
+    for date, rows, error in run_batch(slate_matchups, args.dates, 1):
+        if error:
+            yield date, None, error
+            continue
+        records = []
+        for rank, row in enumerate(rank_matchups(rows, args.min_ab)[:args.top], 1):
+            stats = row.pop('stats')
+            records.append(dict(date=date, rank=rank, **row, **asdict(stats),
+                                avg=format_avg(stats.avg), ops=format_avg(stats.ops)))
+        yield date, records, None
+
+
+def ingest_records(args):
+    try:
+        for summary in ingest_dates(args.start, args.end, max_workers=args.workers, force=args.force):
+            if summary['errors']:
+                yield summary['date'], None, '; '.join(summary['errors'])
+            else:
+                yield summary['date'], [summary], None
+    except ValueError as e:
+        yield args.start or 'warehouse', None, e
+
+
+def leader_records(args):
+    start_date, end_date = date_range(args.days, args.start, args.end)
+    for stat in args.stats:
+        try:
+            rows = leaders(stat, start_date, end_date, args.top, args.team, args.min)
+        except ValueError as e:
+            yield stat, None, e
+            continue
+        # Batting stats have a pa sample and pitching ones outs, both columns are always there
+        yield stat, [dict(row, pa=row.get('pa'), outs=row.get('outs'), start=start_date, end=end_date)
+                     for row in rows], None
+
+
+def fantasy_records(args):
+    try:
+        scoring = load_scoring(args.scoring)
+    except (OSError, ValueError) as e:
+        yield args.scoring, None, e
+        return
+
+    # Dates score those slates, otherwise it's running totals over the warehouse
+    if args.dates:
+        for date in args.dates:
+            yield date, slate_points(date, scoring)[:args.top], None
+        return
+
+    start_date, end_date = date_range(args.days, args.start, args.end)
+    rows = fantasy_leaders(start_date, end_date, args.top, args.team, scoring)
+    yield 'leaders', [dict(row, start=start_date, end=end_date) for row in rows], None
+
+
+def snapshot_records(args):
+    if args.action == 'info':
+        yield args.path, [snapshot_info(args.path)], None
+        return
+    yield args.path, [export_snapshot(args.path, args.start, args.end, args.players or (), args.seasons,
+                                      max_workers=args.workers)], None
+
+
+def quota_records(args):
+    yield 'quota', [QUOTA.as_dict()], None
+
+
+def matchup_records(args):
+    index = get_player_index()
+    for name in args.pitchers:
+        pitcher = index.find(name)
+        if pitcher is None:
+            yield name, None, "pitcher not found"
+            continue
+        for team in args.teams:
+            batters = [p for p in index.by_team(team) if p.player_id != pitcher.player_id]
+            results = fetch_batter_vs_pitcher(pitcher.player_id, [b.player_id for b in batters],
+                                              max_workers=args.workers)
+            records = [
+                dict(pitcher_id=pitcher.player_id, pitcher=pitcher.name, team=team.upper(),
+                     batter_id=batter.player_id, batter=batter.name,
+                     **(asdict(stats) if stats is not None else empty_record(BattingLine)))
+                for batter, stats in zip(batters, results)
+            ]
+            yield f"{name} vs {team}", records, None
+
+
+COMMANDS = {
+    'boxscore': boxscore_records,
+    'scoreboard': scoreboard_records,
+    'player': player_records,
+    'gamelog': gamelog_records,
+    'matchups': matchup_records,
+    'slate': slate_records,
+    'ingest': ingest_records,
+    'leaders': leader_records,
+    'fantasy': fantasy_records,
+    'snapshot': snapshot_records,
+    'quota': quota_records
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Headless MLB stat queries. Output is JSON Lines (default) or CSV on stdout."
+    )
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--workers', type=int, default=4, help="how many queries to run at once")
+    parser.add_argument('--profile', action='store_true', help="print where the time went to stderr")
+    parser.add_argument('--trace', metavar='FILE', help="write an OpenTelemetry (OTLP/JSON) trace of the run")
+    parser.add_argument('--offline', metavar='FILE', help="answer every API call from a snapshot, no network")
+    parser.add_argument('--record-snapshot', metavar='FILE', help="save every API answer of the run as a snapshot")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    box = sub.add_parser('boxscore', help="box scores for one or more game IDs (YYYYMMDD_AWAY@HOME)")
+    box.add_argument('game_ids', nargs='+')
+    box.add_argument('--no-players', action='store_true', help="leave out the player stat lines")
+
+    scoreboard = sub.add_parser('scoreboard', help="scoreboards for one or more dates (YYYYMMDD)")
+    scoreboard.add_argument('dates', nargs='+')
+
+    player = sub.add_parser('player', help="recent game logs for one or more players by name")
+    player.add_argument('names', nargs='+')
+    player.add_argument('--games', type=int, default=10)
+    player.add_argument('--season', default=DEFAULT_SEASON)
+
+    gamelog = sub.add_parser('gamelog', help="full season/date range game logs with cumulative and rolling rates")
+    gamelog.add_argument('names', nargs='+')
+    gamelog.add_argument('--season', dest='seasons', action='append', help="repeat for several seasons")
+    gamelog.add_argument('--start', help="first date to include (YYYYMMDD)")
+    gamelog.add_argument('--end', help="last date to include (YYYYMMDD)")
+    gamelog.add_argument('--window', type=int, default=7, help="rolling window size in games")
+
+    matchups = sub.add_parser('matchups', help="batter vs pitcher stats for every pitcher/team pair")
+    matchups.add_argument('--pitcher', dest='pitchers', action='append', required=True)
+    matchups.add_argument('--team', dest='teams', action='append', required=True)
+
+    slate = sub.add_parser('slate', help="ranked batter vs probable starter matchups for every game on a date")
+    slate.add_argument('dates', nargs='+')
+    slate.add_argument('--top', type=int, default=50)
+    slate.add_argument('--min-ab', type=int, default=None, help="at bats needed to rank ahead of small samples")
+
+    ingest = sub.add_parser('ingest', help="store Final games in the local SQLite warehouse")
+    ingest.add_argument('--start', help="first date (YYYYMMDD), defaults to the first day the warehouse is missing")
+    ingest.add_argument('--end', help="last date (YYYYMMDD), defaults to yesterday")
+    ingest.add_argument('--force', action='store_true', help="fetch dates that are already ingested again")
+
+    leaders_parser = sub.add_parser('leaders', help="top players on one or more stats over a date range, from the warehouse")
+    leaders_parser.add_argument('stats', nargs='+', metavar='STAT', help=', '.join(LEADER_STATS))
+    leaders_parser.add_argument('--days', type=int, help="only the last N days")
+    leaders_parser.add_argument('--start', help="first date to include (YYYYMMDD)")
+    leaders_parser.add_argument('--end', help="last date to include (YYYYMMDD)")
+    leaders_parser.add_argument('--top', type=int, default=10)
+    leaders_parser.add_argument('--team', help="only players on this team")
+    leaders_parser.add_argument('--min', type=float, default=None,
+                                help="PA (batting) or outs (pitching) needed for rate stats")
+
+    fantasy = sub.add_parser('fantasy', help="fantasy points for the slates on some dates, or season leaders from the warehouse")
+    fantasy.add_argument('dates', nargs='*', help="score every player line on these dates (YYYYMMDD)")
+    fantasy.add_argument('--days', type=int, help="leaders over the last N days")
+    fantasy.add_argument('--start', help="first date to include (YYYYMMDD)")
+    fantasy.add_argument('--end', help="last date to include (YYYYMMDD)")
+    fantasy.add_argument('--top', type=int, default=25)
+    fantasy.add_argument('--team', help="only players on this team (leaders)")
+    fantasy.add_argument('--scoring', help="JSON file of points per stat (default FANTASY_SCORING_FILE)")
+
+    snapshot = sub.add_parser('snapshot', help="export scoreboards, box scores, the roster and game logs for offline use")
+    snapshot.add_argument('action', choices=['export', 'info'])
+    snapshot.add_argument('path', help="archive file, e.g. week.jsonl.gz")
+    snapshot.add_argument('--start', help="first date to export (YYYYMMDD)")
+    snapshot.add_argument('--end', help="last date to export (YYYYMMDD), defaults to --start")
+    snapshot.add_argument('--player', dest='players', action='append', help="full season game logs, repeatable")
+    snapshot.add_argument('--season', dest='seasons', action='append', help="seasons for --player, repeatable")
+
+    sub.add_parser('quota', help="API calls used and left in this month's quota")
+
+    serve = sub.add_parser('serve', help="serve the box score, scoreboard, player and matchup queries over HTTP/JSON")
+    serve.add_argument('--host', default=None, help="address to listen on (default SERVER_HOST or 127.0.0.1)")
+    serve.add_argument('--port', type=int, default=None, help="port to listen on (default SERVER_PORT or 8765)")
+
+    # --format and --workers work after the command too, SUPPRESS leaves the global value alone unless given there
+    for command_parser in sub.choices.values():
+        command_parser.add_argument('--format', choices=['jsonl', 'csv'], default=argparse.SUPPRESS)
+        command_parser.add_argument('--workers', type=int, default=argparse.SUPPRESS,
+                                    help="how many queries to run at once")
+
+    return parser
+
+
+def main(argv=None):
+    # --profile/--trace/--offline/--record-snapshot are accepted anywhere, not only before the command
+    # (--format/--workers are also on every subcommand, see build_parser)
+    argv, profile, trace_path = parse_profile_args(sys.argv[1:] if argv is None else argv)
+    argv, offline_path, record_path = parse_snapshot_args(argv)
+    args = build_parser().parse_args(argv)
+    args.profile = args.profile or profile
+    args.trace = args.trace or trace_path
+    args.offline = args.offline or offline_path
+    args.record_snapshot = args.record_snapshot or record_path
+    if args.offline:
+        go_offline(args.offline)
+    recording = start_recording() if args.record_snapshot else None
+    if args.command == 'serve':
+        import server
+        return server.serve(args.host or server.SERVER_HOST, args.port or server.SERVER_PORT)
+
+    writer = RecordWriter(args.format)
+    failed = 0
+    if args.profile or args.trace:
+        PROFILER.enable()
+
+    with PROFILER.action(f"cli.{args.command}"):
+        for item, records, error in COMMANDS[args.command](args):
+            if error:
+                failed += 1
+                print(f"{args.command} {item}: {error}", file=sys.stderr)
+                continue
+            for record in records:
+                writer.write(record)
+
+    # stdout is for records, the profile goes to stderr
+    if args.profile:
+        Console(stderr=True).print(PROFILER.summary_panel(title=f"Profile: {args.command}"))
+    if args.trace:
+        PROFILER.export(args.trace)
+    if recording is not None:
+        save_recording(recording, args.record_snapshot)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+import heapq
+import json
+import os
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.table import Table
+
+from leaderboard import ROLE_COLUMNS, date_range
+from profiler import PROFILER
+from util_methods import (
+    console,
+    color_team,
+    MATCHUP_CONCURRENCY,
+    WAREHOUSE,
+    fetch_box_score,
+    fetch_scoreboard,
+    get_player_index
+)
+
+# Points per stat, DraftKings style. Stats are BattingLine/PitchingLine attribute
+# names plus 'singles'; outs are thirds of an inning (0.75 per out = 2.25 per IP)
+DEFAULT_SCORING = {
+    'batting': {'singles': 3, 'doubles': 5, 'triples': 8, 'hr': 10, 'rbi': 2, 'r': 2, 'bb': 2, 'hbp': 2, 'sb': 5},
+    'pitching': {'outs': 0.75, 'so': 2, 'win': 4, 'er': -2, 'h': -0.6, 'bb': -0.6}
+}
+
+# Optional JSON file overriding some or all of DEFAULT_SCORING, e.g. {"batting": {"hr": 4}}
+FANTASY_SCORING_FILE = os.getenv('FANTASY_SCORING_FILE',
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fantasy_scoring.json'))
+
+BATTING_STATS = tuple(ROLE_COLUMNS['batted'].values())
+PITCHING_STATS = tuple(ROLE_COLUMNS['pitched'].values())
+SCORABLE_STATS = {'batting': BATTING_STATS + ('singles',), 'pitching': PITCHING_STATS}
+
+# Warehouse player_lines columns in the order SlateFrame.from_warehouse_rows reads them
+WAREHOUSE_COLUMNS = tuple(ROLE_COLUMNS['batted']) + tuple(ROLE_COLUMNS['pitched']) + ('fantasy_points',)
+
+
+def load_scoring(path=None):
+    """DEFAULT_SCORING with any overrides from `path` (or FANTASY_SCORING_FILE if it exists)."""
+    scoring = {role: dict(rules) for role, rules in DEFAULT_SCORING.items()}
+    path = path or (FANTASY_SCORING_FILE if os.path.exists(FANTASY_SCORING_FILE) else None)
+    if not path:
+        return scoring
+
+    with open(path) as f:
+        custom = json.load(f)
+    for role, rules in custom.items():
+        if role not in SCORABLE_STATS:
+            raise ValueError(f"Unknown scoring section '{role}', use 'batting' or 'pitching'")
+        for stat, points in rules.items():
+            if stat not in SCORABLE_STATS[role]:
+                raise ValueError(f"Can't score '{stat}' for {role}, choose from {', '.join(SCORABLE_STATS[role])}")
+            scoring[role][stat] = float(points)
+    return scoring
+
+
+class SlateFrame:
+    """
+    Column oriented player lines for a set of games: one array per stat, one
+    slot per player line. Points for every line come from a weighted sum over
+    whole columns, one pass per scored stat.
+    """
+
+    def __init__(self):
+        self.player_ids = []
+        self.names = []
+        self.teams = []
+        self.game_ids = []
+        self.api_points = array('d')
+        self.columns = {(role, stat): array('l')
+                        for role, stats in (('batting', BATTING_STATS), ('pitching', PITCHING_STATS))
+                        for stat in stats}
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def add(self, player_id, name, team, game_id, batting=None, pitching=None, api_points=0.0):
+        """Append one line, batting/pitching are {stat: value} dicts (None if they didn't bat/pitch)."""
+        self.player_ids.append(player_id)
+        self.names.append(name or player_id)
+        self.teams.append(team or '')
+        self.game_ids.append(game_id)
+        self.api_points.append(api_points or 0.0)
+        for stat in BATTING_STATS:
+            self.columns[('batting', stat)].append(batting.get(stat, 0) if batting else 0)
+        for stat in PITCHING_STATS:
+            self.columns[('pitching', stat)].append(pitching.get(stat, 0) if pitching else 0)
+
+    @classmethod
+    def from_box_scores(cls, boxes):
+        frame = cls()
+        for box in boxes:
+            for player in box.players:
+                if not player.player_id or (player.batting is None and player.pitching is None):
+                    continue
+                frame.add(
+                    player.player_id, player.name, player.team, box.game_id,
+                    {stat: getattr(player.batting, stat) for stat in BATTING_STATS} if player.batting else None,
+                    {stat: getattr(player.pitching, stat) for stat in PITCHING_STATS} if player.pitching else None,
+                    player.fantasy_points
+                )
+        return frame
+
+    @classmethod
+    def from_warehouse_rows(cls, rows):
+        """Rows from Warehouse.player_lines_on(date, WAREHOUSE_COLUMNS)."""
+        frame = cls()
+        batting_end = len(BATTING_STATS)
+        pitching_end = batting_end + len(PITCHING_STATS)
+        for player_id, name, team, game_id, batted, pitched, *values in rows:
+            frame.add(
+                player_id, name, team, game_id,
+                dict(zip(BATTING_STATS, values[:batting_end])) if batted else None,
+                dict(zip(PITCHING_STATS, values[batting_end:pitching_end])) if pitched else None,
+                values[pitching_end]
+            )
+        return frame
+
+    def _column(self, role, stat):
+        if stat == 'singles':
+            c = self.columns
+            return [h - d - t - hr for h, d, t, hr in zip(c[('batting', 'h')], c[('batting', 'doubles')],
+                                                          c[('batting', 'triples')], c[('batting', 'hr')])]
+        return self.columns[(role, stat)]
+
+    def points(self, scoring):
+        """(batting points, pitching points) lists, one entry per line."""
+        totals = {}
+        for role in ('batting', 'pitching'):
+            total = [0.0] * len(self)
+            for stat, weight in scoring[role].items():
+                if weight:
+                    total = [t + weight * v for t, v in zip(total, self._column(role, stat))]
+            totals[role] = total
+        return totals['batting'], totals['pitching']
+
+
+def slate_frame(date):
+    """
+    SlateFrame of every player line on `date`: straight from the warehouse
+    once the date is ingested, otherwise from the (cached) box scores of the
+    day's live and Final games.
+    """
+    if WAREHOUSE.is_date_ingested(date):
+        with PROFILER.span("warehouse.read", query="fantasy_slate"):
+            return SlateFrame.from_warehouse_rows(WAREHOUSE.player_lines_on(date, WAREHOUSE_COLUMNS))
+
+    games = [game for game in fetch_scoreboard(date) if game.is_live or game.is_final]
+    if not games:
+        return SlateFrame()
+    with ThreadPoolExecutor(max_workers=min(MATCHUP_CONCURRENCY, len(games))) as executor:
+        boxes = [box for box in executor.map(lambda game: fetch_box_score(game.game_id), games) if box]
+    return SlateFrame.from_box_scores(boxes)
+
+
+def slate_points(date, scoring=None, frame=None):
+    """Every player line on `date` with its fantasy points, highest first. Returns a list of dict rows."""
+    scoring = scoring or load_scoring()
+    frame = frame if frame is not None else slate_frame(date)
+    batting, pitching = frame.points(scoring)
+    rows = [
+        {
+            'date': date,
+            'game_id': frame.game_ids[i],
+            'player_id': frame.player_ids[i],
+            'player': frame.names[i],
+            'team': frame.teams[i],
+            'batting_points': round(batting[i], 2),
+            'pitching_points': round(pitching[i], 2),
+            'points': round(batting[i] + pitching[i], 2),
+            'api_points': frame.api_points[i]
+        }
+        for i in range(len(frame))
+    ]
+    rows.sort(key=lambda row: -row['points'])
+    return rows
+
+
+class FantasyLedger:
+    """
+    Running fantasy totals per player from start_date on. Dates are added one
+    at a time and only once, so extending the range to a newly ingested day
+    costs that day alone, and ranking is a heap selection over the totals.
+    """
+
+    def __init__(self, scoring, start_date=None):
+        self.scoring = scoring
+        self.start_date = start_date
+        self.dates = set()
+        self.last_date = None
+        self.totals = {}  # player_id -> [points, games, name, team]
+        self._lock = threading.Lock()
+
+    def add(self, date, frame):
+        batting, pitching = frame.points(self.scoring)
+        with self._lock:
+            if date in self.dates:
+                return
+            for i, player_id in enumerate(frame.player_ids):
+                entry = self.totals.get(player_id)
+                if entry is None:
+                    entry = self.totals[player_id] = [0.0, 0, frame.names[i], frame.teams[i]]
+                entry[0] += batting[i] + pitching[i]
+                entry[1] += 1
+                entry[3] = frame.teams[i] or entry[3]
+            self.dates.add(date)
+            self.last_date = max(self.last_date or date, date)
+
+    def update(self, end_date=None, warehouse=WAREHOUSE):
+        """Add every ingested date up to end_date that isn't in the totals yet. Returns how many were added."""
+        added = 0
+        for date in warehouse.ingested_dates(self.start_date, end_date):
+            if date not in self.dates:
+                self.add(date, SlateFrame.from_warehouse_rows(warehouse.player_lines_on(date, WAREHOUSE_COLUMNS)))
+                added += 1
+        return added
+
+    def top(self, count=25, team=None):
+        team = team.upper() if team else None
+        with self._lock:
+            entries = [(player_id, entry) for player_id, entry in self.totals.items()
+                       if team is None or entry[3] == team]
+        best = heapq.nlargest(count, entries, key=lambda item: item[1][0])
+        return [
+            {
+                'rank': rank,
+                'player_id': player_id,
+                'player': name,
+                'team': player_team,
+                'games': games,
+                'points': round(points, 2),
+                'points_per_game': round(points / games, 2) if games else 0.0
+            }
+            for rank, (player_id, (points, games, name, player_team)) in enumerate(best, 1)
+        ]
+
+
+_LEDGERS = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def fantasy_leaders(start_date=None, end_date=None, top=25, team=None, scoring=None):
+    """
+    Top fantasy scorers over ingested dates between start_date and end_date.
+    Ledgers are kept per scoring rules and start date, so asking again after a
+    new day is ingested only scores that day.
+    """
+    scoring = scoring or load_scoring()
+    key = (json.dumps(scoring, sort_keys=True), start_date)
+    with _LEDGERS_LOCK:
+        ledger = _LEDGERS.get(key)
+        # A ledger that already went past end_date can't be trimmed back, start over
+        if ledger is None or (end_date and ledger.last_date and ledger.last_date > end_date):
+            ledger = _LEDGERS[key] = FantasyLedger(scoring, start_date)
+    with PROFILER.span("fantasy.update"):
+        ledger.update(end_date)
+    return ledger.top(top, team)
+
+
+# ----- DISPLAY ------------------
+
+def get_fantasy_slate(date, top=25, scoring=None):
+    """Print the top fantasy performers on one date."""
+    try:
+        rows = slate_points(date, scoring)
+        if not rows:
+            console.print("[red]No live or finished games found for this date[/red]")
+            return None
+
+        table = Table(title=f"Fantasy Points for {date}")
+        table.add_column("#", style="bold cyan", justify="center")
+        table.add_column("Player", style="cyan")
+        table.add_column("Team", justify="center")
+        table.add_column("Batting", justify="center")
+        table.add_column("Pitching", justify="center")
+        table.add_column("Points", justify="center", style="bold green")
+
+        for rank, row in enumerate(rows[:top], 1):
+            table.add_row(
+                str(rank),
+                row['player'],
+                color_team(row['team']),
+                f"{row['batting_points']:.2f}",
+                f"{row['pitching_points']:.2f}",
+                f"{row['points']:.2f}"
+            )
+
+        console.print(table)
+        return rows
+
+    except Exception as e:
+        console.print(f"[red]Error scoring fantasy points: {str(e)}[/red]")
+        return None
+
+
+def get_fantasy_leaders(days=None, start_date=None, end_date=None, top=25, team=None, scoring=None):
+    """Print the top fantasy scorers over the last `days` days or a date range, from the warehouse."""
+    try:
+        if not WAREHOUSE.exists():
+            console.print("[red]The stats warehouse is empty, run `python main.py ingest --start YYYYMMDD` first[/red]")
+            return None
+
+        start_date, end_date = date_range(days, start_date, end_date)
+        rows = fantasy_leaders(start_date, end_date, top, team, scoring)
+        if not rows:
+            console.print("[red]No games found for that range[/red]")
+            return None
+
+        # Box scores don't always carry names, the roster does
+        if any(row['player'] == row['player_id'] for row in rows):
+            index = get_player_index()
+            for row in rows:
+                player = index.by_id(row['player_id'])
+                if player is not None and row['player'] == row['player_id']:
+                    row['player'] = player.name
+
+        span = f"last {days} days" if days else f"{start_date or 'start'} to {end_date or 'latest'}"
+        table = Table(title=f"Fantasy Leaders ({span})")
+        table.add_column("#", style="bold cyan", justify="center")
+        table.add_column("Player", style="cyan")
+        table.add_column("Team", justify="center")
+        table.add_column("G", justify="center")
+        table.add_column("Pts/G", justify="center")
+        table.add_column("Points", justify="center", style="bold green")
+
+        for row in rows:
+            table.add_row(
+                str(row['rank']),
+                row['player'],
+                color_team(row['team']),
+                str(row['games']),
+                f"{row['points_per_game']:.2f}",
+                f"{row['points']:.2f}"
+            )
+
+        console.print(table)
+        return rows
+
+    except Exception as e:
+        console.print(f"[red]Error building fantasy leaderboard: {str(e)}[/red]")
+        return None
@@ -0,0 +1,195 @@
+import os
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate
+
+from rich.table import Table
+
+from models import format_avg, parse_game_log
+from profiler import PROFILER
+from response_cache import PINNED
+from util_methods import (
+    console,
+    color_team,
+    DEFAULT_SEASON,
+    RESPONSE_CACHE,
+    _fetch_json
+)
+
+# Seconds to cache the game log of a season that is still being played
+CURRENT_SEASON_TTL = int(os.getenv('CURRENT_SEASON_TTL', '3600'))
+
+# Columns kept for every game, in BattingLine attribute names
+STAT_COLUMNS = ('ab', 'h', 'r', 'rbi', 'bb', 'so', 'hr', 'doubles', 'triples', 'hbp', 'sf', 'sb', 'cs')
+
+
+def _rate(numerators, denominators):
+    return array('d', (n / d if d else 0.0 for n, d in zip(numerators, denominators)))
+
+
+def _window_sums(prefix, window):
+    """Rolling sums over `window` games from a prefix sum column (prefix[0] == 0)."""
+    return array('l', (prefix[i] - prefix[max(0, i - window)] for i in range(1, len(prefix))))
+
+
+class GameLogFrame:
+    """
+    Column oriented game log: one array per stat, one slot per game, oldest game
+    first. Cumulative and rolling rates come from prefix sums, so a window of any
+    size costs one pass over the columns instead of re-adding every game.
+    """
+
+    def __init__(self, entries):
+        entries = sorted(entries, key=lambda entry: entry.game_id)
+        self.game_ids = [entry.game_id for entry in entries]
+        self.dates = [entry.date for entry in entries]
+        self.teams = [entry.team for entry in entries]
+        self.positions = [entry.position for entry in entries]
+        self.columns = {
+            stat: array('l', (getattr(entry.batting, stat) for entry in entries))
+            for stat in STAT_COLUMNS
+        }
+        self._prefix = {}
+
+    def __len__(self):
+        return len(self.game_ids)
+
+    def column(self, stat):
+        return self.columns[stat]
+
+    def prefix_sums(self, stat):
+        """prefix[i] = total of `stat` over the first i games."""
+        if stat not in self._prefix:
+            self._prefix[stat] = array('l', accumulate(self.columns[stat], initial=0))
+        return self._prefix[stat]
+
+    def total_bases(self):
+        c = self.columns
+        return array('l', (h + d + 2 * t + 3 * hr for h, d, t, hr in zip(c['h'], c['doubles'], c['triples'], c['hr'])))
+
+    def cumulative(self):
+        """Season-to-date AVG/OBP/SLG/OPS after every game."""
+        return self._rates({stat: self.prefix_sums(stat)[1:] for stat in STAT_COLUMNS},
+                           array('l', accumulate(self.total_bases())))
+
+    def rolling(self, window):
+        """AVG/OBP/SLG/OPS over the last `window` games at every game."""
+        sums = {stat: _window_sums(self.prefix_sums(stat), window) for stat in STAT_COLUMNS}
+        total_bases = _window_sums(array('l', accumulate(self.total_bases(), initial=0)), window)
+        return self._rates(sums, total_bases)
+
+    def totals(self):
+        """Counting stat totals over the whole frame."""
+        return {stat: self.prefix_sums(stat)[-1] for stat in STAT_COLUMNS}
+
+    def _rates(self, sums, total_bases):
+        on_base = [h + bb + hbp for h, bb, hbp in zip(sums['h'], sums['bb'], sums['hbp'])]
+        plate_appearances = [ab + bb + hbp + sf for ab, bb, hbp, sf in zip(sums['ab'], sums['bb'], sums['hbp'], sums['sf'])]
+        avg = _rate(sums['h'], sums['ab'])
+        obp = _rate(on_base, plate_appearances)
+        slg = _rate(total_bases, sums['ab'])
+        ops = array('d', (o + s for o, s in zip(obp, slg)))
+        return {'AVG': avg, 'OBP': obp, 'SLG': slg, 'OPS': ops}
+
+
+def season_ttl(season):
+    """Past seasons are over so their game logs are pinned, the current one is refreshed hourly."""
+    return PINNED if str(season) < DEFAULT_SEASON else CURRENT_SEASON_TTL
+
+
+def season_query(player_id, season):
+    return {
+        "playerID": str(player_id),
+        "season": str(season)
+    }
+
+
+def fetch_season_entries(player_id, season):
+    """Every game a player has played in `season`, as GameLogEntry models."""
+    data = RESPONSE_CACHE.get_json(_fetch_json, "getMLBGamesForPlayer", season_query(player_id, season),
+                                   lambda payload: season_ttl(season) if payload.get('body') else 0)
+    with PROFILER.span("parse.game_log"):
+        return parse_game_log(data.get('body'))
+
+
+def fetch_game_log_frame(player_id, seasons=None, start_date=None, end_date=None):
+    """
+    Build a GameLogFrame for a player over one or more seasons, optionally cut
+    down to games between start_date and end_date (YYYYMMDD, inclusive).
+    """
+    seasons = seasons or [DEFAULT_SEASON]
+    entries = []
+    for season in seasons:
+        entries.extend(fetch_season_entries(player_id, season))
+
+    if start_date:
+        entries = [entry for entry in entries if entry.date >= start_date]
+    if end_date:
+        entries = [entry for entry in entries if entry.date <= end_date]
+    return GameLogFrame(entries)
+
+
+def fetch_game_log_frames(player_ids, seasons=None, start_date=None, end_date=None, max_workers=8):
+    """fetch_game_log_frame for many players at once, returns {player_id: GameLogFrame}."""
+    player_ids = list(player_ids)
+    if not player_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(player_ids))) as executor:
+        frames = executor.map(lambda pid: fetch_game_log_frame(pid, seasons, start_date, end_date), player_ids)
+        return dict(zip(player_ids, frames))
+
+
+def get_player_season_stats(player_id, seasons=None, start_date=None, end_date=None, window=7):
+    """
+    Print a player's game log over whole seasons or a date range, with running
+    season-to-date AVG/OBP/SLG/OPS and a rolling `window` game OPS.
+    """
+    try:
+        frame = fetch_game_log_frame(player_id, seasons, start_date, end_date)
+        if not len(frame):
+            console.print("[red]No games found for that player and range[/red]")
+            return None
+
+        cumulative = frame.cumulative()
+        rolling = frame.rolling(window)
+        c = frame.columns
+
+        table = Table(title=f"Game Log ({len(frame)} games)")
+        table.add_column("Game Date", style="cyan", justify="center")
+        table.add_column("Team", style="green", justify="center")
+        table.add_column("AB", justify="center")
+        table.add_column("H", justify="center")
+        table.add_column("HR", justify="center", style="yellow")
+        table.add_column("RBI", justify="center")
+        table.add_column("BB", justify="center")
+        table.add_column("SO", justify="center")
+        table.add_column("AVG", justify="center", style="green")
+        table.add_column("OBP", justify="center", style="green")
+        table.add_column("SLG", justify="center", style="green")
+        table.add_column("OPS", justify="center", style="bold green")
+        table.add_column(f"OPS ({window}G)", justify="center", style="magenta")
+
+        for i in range(len(frame)):
+            table.add_row(
+                frame.dates[i],
+                color_team(frame.teams[i]),
+                str(c['ab'][i]),
+                str(c['h'][i]),
+                str(c['hr'][i]),
+                str(c['rbi'][i]),
+                str(c['bb'][i]),
+                str(c['so'][i]),
+                format_avg(cumulative['AVG'][i]),
+                format_avg(cumulative['OBP'][i]),
+                format_avg(cumulative['SLG'][i]),
+                format_avg(cumulative['OPS'][i]),
+                format_avg(rolling['OPS'][i])
+            )
+
+        with PROFILER.span("render.game_log", rows=len(frame)):
+            console.print(table)
+        return frame
+
+    except Exception as e:
+        console.print(f"[red]Error fetching game log: {str(e)}[/red]")
+        return None
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from models import parse_scoreboard
+from util_methods import (
+    WAREHOUSE,
+    MATCHUP_CONCURRENCY,
+    _fetch_json,
+    box_score_query,
+    scoreboard_query
+)
+
+
+def _days(start_date, end_date):
+    day = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+    while day <= end:
+        yield day.strftime("%Y%m%d")
+        day += timedelta(days=1)
+
+
+def _fetch_box_score_body(game_id):
+    """(body, None) for a game, or (None, error message) if the request failed."""
+    try:
+        return _fetch_json("getMLBBoxScore", box_score_query(game_id)).get('body'), None
+    except Exception as e:
+        return None, f"{game_id}: {e}"
+
+
+def ingest_dates(start_date=None, end_date=None, warehouse=WAREHOUSE, max_workers=None, force=False):
+    """
+    Walk dates with getMLBScoresOnly and store the box score of every Final game
+    in the warehouse. Without a start_date it resumes at the first day missing
+    from the warehouse, so a day left unfinished by an earlier run gets filled
+    in. Dates already ingested are skipped unless `force` is set. A date is
+    only marked done once none of its games are live or still to be played
+    and every box score was stored, so unfinished days get picked up again
+    next run. Yields a summary per date, with the failures under 'errors'.
+    """
+    end_date = end_date or (datetime.now() - timedelta(days=1)).strftime("%Y%m%d")
+    if not start_date:
+        start_date = warehouse.first_missing_date()
+        if not start_date:
+            raise ValueError("The warehouse is empty, give a start date for the first ingest")
+
+    max_workers = max_workers or MATCHUP_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for game_date in _days(start_date, end_date):
+            if not force and warehouse.is_date_ingested(game_date):
+                continue
+
+            # One failed request only costs its own date, the run carries on
+            try:
+                payload = _fetch_json("getMLBScoresOnly", scoreboard_query(game_date))
+            except Exception as e:
+                yield {'date': game_date, 'games': 0, 'stored': 0, 'complete': False, 'errors': [str(e)]}
+                continue
+            games = parse_scoreboard(payload.get('body', {}))
+
+            to_fetch = [game.game_id for game in games if game.is_final and not warehouse.has_game(game.game_id)]
+            stored, errors = 0, []
+            for game_id, (body, error) in zip(to_fetch, executor.map(_fetch_box_score_body, to_fetch)):
+                if error:
+                    errors.append(error)
+                elif warehouse.store_box_score(game_id, game_date, body) is not None:
+                    stored += 1
+
+            # Postponed/suspended games don't hold a date back, only live or upcoming ones
+            complete = not errors and not any(game.status_code in ("0", "1") for game in games)
+            if complete:
+                warehouse.mark_date_ingested(game_date)
+
+            yield {
+                'date': game_date,
+                'games': len(games),
+                'stored': stored,
+                'complete': complete,
+                'errors': errors
+            }
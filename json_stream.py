@@ -0,0 +1,111 @@
+"""
+Incremental JSON reading for big API responses. Elements of one array in the
+top level object are decoded and yielded as the bytes arrive, so the whole
+payload never has to be held as text plus a full tree of dicts at once.
+"""
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# Drop text that has already been decoded once this much of it piles up
+_COMPACT_AT = 1 << 16
+
+
+class _Reader:
+    """Text buffer over an iterable of byte chunks, refilled on demand."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.done = False
+
+    def fill(self):
+        """Append the next chunk, returns False once the input is exhausted."""
+        if self.done:
+            return False
+        if self.pos >= _COMPACT_AT:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._utf8.decode(b'', final=True)
+        self.done = True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), '' at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of streamed JSON")
+        self.pos += 1
+
+    def value(self):
+        """
+        Decode the next complete JSON value. A value that runs up to the end of
+        the buffer may be cut off mid-chunk (a number, say), so it's only trusted
+        once more text follows it or the input is finished.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.done:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.done:
+                    raise
+            self.fill()
+
+
+def iter_array(chunks, key='body', fields=None):
+    """
+    Yield the elements of the array stored under `key` in a streamed top level
+    JSON object, e.g. the player dicts of {"statusCode": 200, "body": [...]}.
+    With `fields` only those keys are kept from each dict element. Stop
+    iterating early and the rest of the input is never read.
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                return
+            while True:
+                item = reader.value()
+                if fields is not None and isinstance(item, dict):
+                    item = {field: item[field] for field in fields if field in item}
+                yield item
+                if reader.peek() == ',':
+                    reader.pos += 1
+                    continue
+                reader.expect(']')
+                return
+
+        reader.value()  # some other member, skip it
+        if reader.peek() == ',':
+            reader.pos += 1
+            continue
+        reader.expect('}')
+        return
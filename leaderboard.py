@@ -0,0 +1,296 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from rich.table import Table
+
+from models import format_avg, outs_to_innings
+from profiler import PROFILER
+from util_methods import console, color_team, get_player_index, WAREHOUSE
+
+# Warehouse player_lines columns summed for each role, and the names they go by here
+ROLE_COLUMNS = {
+    'batted': {
+        'ab': 'ab', 'h': 'h', 'r': 'r', 'rbi': 'rbi', 'bb': 'bb', 'so': 'so', 'hr': 'hr',
+        'doubles': 'doubles', 'triples': 'triples', 'hbp': 'hbp', 'sf': 'sf', 'sb': 'sb', 'cs': 'cs'
+    },
+    'pitched': {
+        'p_outs': 'outs', 'p_h': 'h', 'p_r': 'r', 'p_er': 'er', 'p_bb': 'bb', 'p_so': 'so',
+        'p_hr': 'hr', 'pitches': 'pitches', 'win': 'win', 'loss': 'loss', 'save': 'save'
+    }
+}
+
+
+def _ratio(numerators, denominators, scale=1.0):
+    return [n * scale / d if d else 0.0 for n, d in zip(numerators, denominators)]
+
+
+def _total_bases(t):
+    return [h + d + 2 * tr + 3 * hr for h, d, tr, hr in zip(t['h'], t['doubles'], t['triples'], t['hr'])]
+
+
+def _plate_appearances(t):
+    return [ab + bb + hbp + sf for ab, bb, hbp, sf in zip(t['ab'], t['bb'], t['hbp'], t['sf'])]
+
+
+def _obp(t):
+    return _ratio([h + bb + hbp for h, bb, hbp in zip(t['h'], t['bb'], t['hbp'])], _plate_appearances(t))
+
+
+def _ops(t):
+    return [o + s for o, s in zip(_obp(t), _ratio(_total_bases(t), t['ab']))]
+
+
+# name: (role, values from the range totals, kind). Rates need a qualifying sample,
+# 'era' style rates rank lowest first.
+LEADER_STATS = {
+    'G': ('batted', lambda t: t['games'], 'count'),
+    'AB': ('batted', lambda t: t['ab'], 'count'),
+    'H': ('batted', lambda t: t['h'], 'count'),
+    'R': ('batted', lambda t: t['r'], 'count'),
+    'RBI': ('batted', lambda t: t['rbi'], 'count'),
+    'HR': ('batted', lambda t: t['hr'], 'count'),
+    '2B': ('batted', lambda t: t['doubles'], 'count'),
+    '3B': ('batted', lambda t: t['triples'], 'count'),
+    'BB': ('batted', lambda t: t['bb'], 'count'),
+    'SO': ('batted', lambda t: t['so'], 'count'),
+    'SB': ('batted', lambda t: t['sb'], 'count'),
+    'TB': ('batted', _total_bases, 'count'),
+    'AVG': ('batted', lambda t: _ratio(t['h'], t['ab']), 'avg'),
+    'OBP': ('batted', _obp, 'avg'),
+    'SLG': ('batted', lambda t: _ratio(_total_bases(t), t['ab']), 'avg'),
+    'OPS': ('batted', _ops, 'avg'),
+    'W': ('pitched', lambda t: t['win'], 'count'),
+    'SV': ('pitched', lambda t: t['save'], 'count'),
+    'K': ('pitched', lambda t: t['so'], 'count'),
+    'IP': ('pitched', lambda t: t['outs'], 'innings'),
+    'ERA': ('pitched', lambda t: _ratio(t['er'], t['outs'], 27), 'era'),
+    'WHIP': ('pitched', lambda t: _ratio([bb + h for bb, h in zip(t['bb'], t['h'])], t['outs'], 3), 'era'),
+    'K9': ('pitched', lambda t: _ratio(t['so'], t['outs'], 27), 'rate')
+}
+
+# Qualifying sample per day in the range with games, like MLB's 3.1 PA and 1 IP per team game
+PA_PER_DAY = 3.1
+OUTS_PER_DAY = 3
+
+
+def _day(date):
+    return int(date) if date else None
+
+
+class RangeFrame:
+    """
+    Column oriented per-player, per-day totals for one role (batting or
+    pitching). Players' days are stored in contiguous blocks, oldest first, with
+    running prefix sums over every column. A date range total for a player is
+    then two binary searches and one subtraction per stat, whatever the range.
+    """
+
+    def __init__(self, rows, columns, version=None):
+        self.version = version
+        self.columns = tuple(columns)
+        self.player_ids = []
+        self.names = []
+        self.offsets = array('l', [0])  # player i's days are days[offsets[i]:offsets[i + 1]]
+        self.days = array('l')
+        self.teams = []  # team on each day, parallel to days (players change teams mid season)
+        values = {column: array('l') for column in self.columns + ('games',)}
+
+        # rows come sorted by player then date, doubleheaders fold into one day
+        for player_id, name, team, game_date, *stats in rows:
+            day = int(game_date)
+            if not self.player_ids or self.player_ids[-1] != player_id:
+                if self.player_ids:
+                    self.offsets.append(len(self.days))
+                self.player_ids.append(player_id)
+                self.names.append(name or player_id)
+            elif self.days[-1] == day:
+                for column, value in zip(self.columns, stats):
+                    values[column][-1] += value or 0
+                values['games'][-1] += 1
+                self.teams[-1] = team or self.teams[-1]
+                continue
+
+            # A line without a team keeps the player's team from the day before
+            self.teams.append(team or (self.teams[-1] if len(self.days) > self.offsets[-1] else ''))
+            self.days.append(day)
+            for column, value in zip(self.columns, stats):
+                values[column].append(value or 0)
+            values['games'].append(1)
+        if self.player_ids:
+            self.offsets.append(len(self.days))
+
+        self.prefix = {column: array('l', accumulate(column_values, initial=0))
+                       for column, column_values in values.items()}
+        self.calendar = array('l', sorted(set(self.days)))
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def bounds(self, start=None, end=None):
+        """Per player (lo, hi) positions of the days inside [start, end]."""
+        lows, highs = [], []
+        for i in range(len(self.player_ids)):
+            first, last = self.offsets[i], self.offsets[i + 1]
+            lows.append(bisect_left(self.days, start, first, last) if start else first)
+            highs.append(bisect_right(self.days, end, first, last) if end else last)
+        return lows, highs
+
+    def totals(self, start=None, end=None):
+        """{column: [total per player]} over days between start and end (YYYYMMDD ints, inclusive)."""
+        lows, highs = self.bounds(start, end)
+        return {
+            column: [prefix[hi] - prefix[lo] for lo, hi in zip(lows, highs)]
+            for column, prefix in self.prefix.items()
+        }
+
+    def teams_in(self, start=None, end=None):
+        """Per player, their team on their last day between start and end ('' if they didn't play)."""
+        lows, highs = self.bounds(start, end)
+        return [self.teams[hi - 1] if hi > lo else '' for lo, hi in zip(lows, highs)]
+
+    def days_with_games(self, start=None, end=None):
+        lo = bisect_left(self.calendar, start) if start else 0
+        hi = bisect_right(self.calendar, end) if end else len(self.calendar)
+        return hi - lo
+
+
+_FRAMES = {}
+_FRAMES_LOCK = threading.Lock()
+
+
+def load_frame(role, warehouse=WAREHOUSE):
+    """The RangeFrame for a role, rebuilt only when the warehouse has new games."""
+    version = warehouse.data_version()
+    with _FRAMES_LOCK:
+        frame = _FRAMES.get((role, warehouse.path))
+        if frame is None or frame.version != version:
+            columns = ROLE_COLUMNS[role]
+            with PROFILER.span("leaderboard.build", role=role):
+                rows = warehouse.player_lines(list(columns), role)
+                frame = RangeFrame(rows, columns.values(), version)
+            _FRAMES[(role, warehouse.path)] = frame
+        return frame
+
+
+def date_range(days=None, start_date=None, end_date=None):
+    """Resolve --days/--start/--end into YYYYMMDD strings; days counts back from today."""
+    if days:
+        today = datetime.now()
+        return (today - timedelta(days=days)).strftime("%Y%m%d"), today.strftime("%Y%m%d")
+    return start_date, end_date
+
+
+def leaders(stat, start_date=None, end_date=None, top=10, team=None, minimum=None, warehouse=WAREHOUSE):
+    """
+    Rank every player on `stat` (see LEADER_STATS) over games between
+    start_date and end_date (YYYYMMDD, inclusive). Rate stats only count players
+    with `minimum` PA (batting) or outs (pitching), by default a qualifying
+    sample for the number of days in the range. Returns a list of dict rows.
+    """
+    stat = stat.upper()
+    if stat not in LEADER_STATS:
+        raise ValueError(f"Unknown stat '{stat}', choose from {', '.join(LEADER_STATS)}")
+    role, compute, kind = LEADER_STATS[stat]
+
+    frame = load_frame(role, warehouse)
+    start, end = _day(start_date), _day(end_date)
+    totals = frame.totals(start, end)
+    teams = frame.teams_in(start, end)
+    values = compute(totals)
+
+    if role == 'batted':
+        sample, sample_name = _plate_appearances(totals), 'pa'
+        default_minimum = PA_PER_DAY * frame.days_with_games(start, end)
+    else:
+        sample, sample_name = totals['outs'], 'outs'
+        default_minimum = OUTS_PER_DAY * frame.days_with_games(start, end)
+    if kind not in ('avg', 'era', 'rate'):
+        default_minimum = 1  # counting stats just need an appearance
+    minimum = default_minimum if minimum is None else minimum
+
+    team = team.upper() if team else None
+    candidates = [
+        i for i in range(len(frame))
+        if totals['games'][i] and sample[i] >= minimum and (team is None or teams[i] == team)
+    ]
+    reverse = kind != 'era'
+    candidates.sort(key=lambda i: (values[i], sample[i]) if reverse else (-values[i], sample[i]), reverse=True)
+
+    rows = []
+    for rank, i in enumerate(candidates[:top], 1):
+        rows.append({
+            'rank': rank,
+            'stat': stat,
+            'value': values[i],
+            'display': format_stat(kind, values[i]),
+            'player_id': frame.player_ids[i],
+            'player': frame.names[i],
+            'team': teams[i],
+            'games': totals['games'][i],
+            sample_name: sample[i]
+        })
+    return rows
+
+
+def format_stat(kind, value):
+    if kind == 'avg':
+        return format_avg(value)
+    if kind in ('era', 'rate'):
+        return f"{value:.2f}"
+    if kind == 'innings':
+        return outs_to_innings(value)
+    return str(value)
+
+
+def get_leaderboard(stat, days=None, start_date=None, end_date=None, top=10, team=None):
+    """Print the top players on `stat` over the last `days` days or a date range."""
+    try:
+        if not WAREHOUSE.exists():
+            console.print("[red]The stats warehouse is empty, run `python main.py ingest --start YYYYMMDD` first[/red]")
+            return None
+
+        start_date, end_date = date_range(days, start_date, end_date)
+        rows = leaders(stat, start_date, end_date, top, team)
+        if not rows:
+            console.print("[red]No qualifying players for that range[/red]")
+            return None
+
+        # Box scores don't always carry names, the roster does
+        if any(row['player'] == row['player_id'] for row in rows):
+            index = get_player_index()
+            for row in rows:
+                player = index.by_id(row['player_id'])
+                if player is not None and row['player'] == row['player_id']:
+                    row['player'] = player.name
+
+        span = f"last {days} days" if days else f"{start_date or 'start'} to {end_date or 'latest'}"
+        sample_name = 'pa' if 'pa' in rows[0] else 'outs'
+        table = Table(title=f"{stat.upper()} Leaders ({span})")
+        table.add_column("#", style="bold cyan", justify="center")
+        table.add_column("Player", style="cyan")
+        table.add_column("Team", justify="center")
+        table.add_column("G", justify="center")
+        table.add_column("PA" if sample_name == 'pa' else "IP", justify="center")
+        table.add_column(stat.upper(), justify="center", style="bold green")
+
+        for row in rows:
+            sample = row[sample_name]
+            table.add_row(
+                str(row['rank']),
+                row['player'],
+                color_team(row['team']),
+                str(row['games']),
+                str(sample) if sample_name == 'pa' else outs_to_innings(sample),
+                row['display']
+            )
+
+        with PROFILER.span("render.leaderboard", rows=len(rows)):
+            console.print(table)
+        return rows
+
+    except Exception as e:
+        console.print(f"[red]Error building leaderboard: {str(e)}[/red]")
+        return None
@@ -1,5 +1,7 @@
+import atexit
 import os
-from rich.prompt import Prompt
+import sys
+from rich.prompt import Confirm, Prompt
 from datetime import datetime
 
 from util_methods import (
@@ -8,31 +10,121 @@ from util_methods import (
     get_daily_scoreboard,
     get_active_players,
     get_pitcher_matchups,
-    get_player_stats 
+    get_player_stats,
+    ROSTER_CACHE,
+    RESPONSE_CACHE,
+    DEFAULT_SEASON
 )
+from scoreboard_watch import watch_scoreboard
+from game_log import get_player_season_stats
+from slate import get_slate_report
+from leaderboard import LEADER_STATS, get_leaderboard
+from fantasy import get_fantasy_leaders, get_fantasy_slate
+from profiler import PROFILER, parse_profile_args
+from prefetch import PREFETCHER
+from snapshot import go_offline, parse_snapshot_args, save_recording, start_recording
+from quota import QUOTA
+from budget import QUOTA_CONFIRM_CALLS, estimate_calls
+
+# Any arguments means a headless query, e.g. `python main.py scoreboard 20250601`
+menu_args, profile, trace_path = parse_profile_args(sys.argv[1:])
+menu_args, offline_path, record_path = parse_snapshot_args(menu_args)
+if menu_args:
+    from cli import main as cli_main
+    sys.exit(cli_main())
+
+# `python main.py --profile` shows a timing breakdown after every action,
+# `--trace FILE` also saves every span as an OpenTelemetry trace on exit
+if profile:
+    PROFILER.enable()
+if trace_path:
+    atexit.register(PROFILER.export, trace_path)
+
+# `--offline FILE` serves everything from a snapshot, `--record-snapshot FILE` saves one on exit
+if offline_path:
+    go_offline(offline_path)
+    console.print(f"[yellow]Offline: answering from {offline_path}[/yellow]")
+if record_path:
+    atexit.register(save_recording, start_recording(), record_path)
+
+# Keep the roster snapshot warm in the background while the menu is open
+ROSTER_CACHE.start_background_refresh()
+
+# Warm today's scoreboard, the roster and box scores while waiting on input
+PREFETCHER.start()
 
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def confirm_cost(name, *args):
+    """Ask before an action that will use a lot of API calls, warn when the quota can't cover it."""
+    calls = estimate_calls(name, *args)
+    if not calls:
+        return True
+    remaining = QUOTA.remaining()
+    if calls > remaining:
+        console.print(f"[yellow]This needs about {calls} API calls but only {remaining} are left this month, "
+                      f"only cached data will be shown where they run out[/yellow]")
+    elif calls >= QUOTA_CONFIRM_CALLS:
+        return Confirm.ask(f"This will use about {calls} API calls ({remaining} left this month). Continue?",
+                           default=True)
+    return True
+
+def run_action(name, func, *args):
+    """
+    Run one menu action (pausing the prefetcher) as its own trace and show its
+    profile panel if profiling is on. Actions that look expensive in API calls
+    are confirmed first.
+    """
+    if not confirm_cost(name, *args):
+        return None
+    stale_before = RESPONSE_CACHE.stale_hits
+    with PREFETCHER.busy(), PROFILER.action(name) as action:
+        result = func(*args)
+    if RESPONSE_CACHE.stale_hits > stale_before:
+        console.print("[yellow]The API quota is running low, some of this is older cached data[/yellow]")
+    if PROFILER.enabled:
+        console.print(PROFILER.summary_panel(PROFILER.trace(action.trace_id), title=f"Profile: {name}"))
+    return result
+
 while True:
+    PREFETCHER.warm_today()
     clear_screen()
     console.rule("Menu Options")
+    console.print(f"[dim]API calls left this month: {QUOTA.remaining()} of {QUOTA.limit}[/dim]")
     console.print("[bold white]Select an option:[/bold white]")
     console.print("[1] Box Score")
     console.print("[2] Pitcher Matchups")
     console.print("[3] Daily Scoreboard")
     console.print("[4] Player Stats")
-    console.print("[5] Quit")
+    console.print("[5] Leaderboards")
+    console.print("[6] Quit")
 
     option1 = Prompt.ask("Enter your choice: ").strip()
     console.print("\n")
     clear_screen()
 
     # ----- QUIT ------------------
-    if option1 == '5':
+    if option1 == '6':
         console.print("Exiting the program.")
         break
 
+    # ----- LEADERBOARDS ------------------
+    elif option1 == '5':
+        console.rule("Leaderboards")
+        console.print(f"[bold white]Stats:[/bold white] {', '.join(LEADER_STATS)}, FPTS (fantasy points)")
+        stat = Prompt.ask("Enter stat", default="HR").strip().upper()
+        days = Prompt.ask("Last how many days (blank for everything in the warehouse)", default="14").strip()
+        team = Prompt.ask("Team abbreviation (blank for all teams)", default="").strip()
+        clear_screen()
+        if stat == 'FPTS':
+            run_action("fantasy_leaders", get_fantasy_leaders, int(days) if days.isdigit() else None,
+                       None, None, 15, team or None)
+        else:
+            run_action("leaderboard", get_leaderboard, stat, int(days) if days.isdigit() else None,
+                       None, None, 15, team or None)
+        Prompt.ask("\nPress Enter to continue...")
+
     # ----- PITCHER MATCHUPS ------------------
     elif option1 == '2':
         while True:
@@ -40,7 +132,8 @@ while True:
             console.print(
                 "[bold white]Enter details or select option:[/bold white]\n"
                 "[1] Search matchups\n"
-                "[2] Back"
+                "[2] Full slate for a date\n"
+                "[3] Back"
             )
 
             option2 = Prompt.ask("Enter your choice").strip()
@@ -51,10 +144,17 @@ while True:
                 pitcher_name = Prompt.ask("Enter pitcher name")
                 opposing_team = Prompt.ask("Enter opposing team abbreviation").upper()
                 clear_screen()
-                get_pitcher_matchups(pitcher_name, opposing_team)
+                run_action("pitcher_matchups", get_pitcher_matchups, pitcher_name, opposing_team)
                 Prompt.ask("\nPress Enter to continue...")
 
             elif option2 == '2':
+                console.rule("\nSlate Matchups")
+                date = Prompt.ask("Enter date (YYYYMMDD format)", default=datetime.now().strftime("%Y%m%d"))
+                clear_screen()
+                run_action("slate", get_slate_report, date)
+                Prompt.ask("\nPress Enter to continue...")
+
+            elif option2 == '3':
                 break
             else:
                 console.print("[red]Invalid option. Please try again.[/red]")
@@ -65,7 +165,7 @@ while True:
     elif option1 == '1':
         console.rule("Box Score!")
         game_id = input("Enter a game ID [YYYYMMDD_AWAY@HOME]: ")
-        get_box_score(game_id)
+        run_action("box_score", get_box_score, game_id)
         Prompt.ask("\nPress Enter to continue...")  # Pause before clearing
 
     # ----- DAILY SCOREBOARD ------------------
@@ -73,17 +173,35 @@ while True:
         while True:
             console.rule("Daily Scoreboard")
             date = Prompt.ask("Enter date (YYYYMMDD format)", default=datetime.now().strftime("%Y%m%d"))
-            game_list = get_daily_scoreboard(date)
+            game_list = run_action("scoreboard", get_daily_scoreboard, date)
             
             if game_list:
+                # Fetch the box scores while the user picks a game
+                PREFETCHER.warm_scoreboard(date)
                 console.print("\n[bold white]Select an option:[/bold white]")
                 console.print("Enter game number to view box score")
+                console.print("Enter 'w' to watch live scores")
+                console.print("Enter 'f' for the day's fantasy points")
                 console.print("Enter 'b' to go back")
                 
                 choice = Prompt.ask("Your choice").strip().lower()
                 
                 if choice == 'b':
                     break
+
+                if choice == 'w':
+                    clear_screen()
+                    run_action("watch_scoreboard", watch_scoreboard, date)
+                    Prompt.ask("\nPress Enter to continue...")
+                    clear_screen()
+                    continue
+
+                if choice == 'f':
+                    clear_screen()
+                    run_action("fantasy_slate", get_fantasy_slate, date)
+                    Prompt.ask("\nPress Enter to continue...")
+                    clear_screen()
+                    continue
                 
                 try:
                     game_idx = int(choice) - 1
@@ -91,7 +209,7 @@ while True:
                         clear_screen()  # Clear screen before showing box score
                         selected_game_id = game_list[game_idx]
                         console.rule(f"Box Score - Game {game_idx + 1}")
-                        get_box_score(selected_game_id)
+                        run_action("box_score", get_box_score, selected_game_id)
                         Prompt.ask("\nPress Enter to continue...")
                         clear_screen()  # Clear screen after viewing box score
                     else:
@@ -108,26 +226,42 @@ while True:
     elif option1 == '4':
         console.rule("Player Stats!")
         player_name = Prompt.ask("Enter player name to search")
-        playerID = get_active_players(player_name)
+        playerID = run_action("player_lookup", get_active_players, player_name)
         if playerID:
             console.print(f"[bold green]Player ID found:[/bold green] {playerID}")
             console.print("\n[bold white]Select an option:[/bold white]")
             console.print("[1] Last Game")
             console.print("[2] 5 Games")
             console.print("[3] 10 Games")
-            console.print("[4] Back")
+            console.print("[4] Seasons / Date Range")
+            console.print("[5] Back")
             option2 = Prompt.ask("Enter your choice").strip()
 
             if option2 == '1':
                 console.rule("Last Game Stats")
-                get_player_stats(playerID, 1)
+                run_action("player_stats", get_player_stats, playerID, 1)
             elif option2 == '2':
                 console.rule("Last 5 Games Stats")
-                get_player_stats(playerID, 5)
+                run_action("player_stats", get_player_stats, playerID, 5)
             elif option2 == '3':
                 console.rule("Last 10 Games Stats")
-                get_player_stats(playerID, 10)
+                run_action("player_stats", get_player_stats, playerID, 10)
             elif option2 == '4':
+                seasons = Prompt.ask("Enter season(s), separated by commas", default=DEFAULT_SEASON)
+                start_date = Prompt.ask("Start date (YYYYMMDD, blank for whole season)", default="")
+                end_date = Prompt.ask("End date (YYYYMMDD, blank for whole season)", default="")
+                window = Prompt.ask("Rolling window (games)", default="7")
+                console.rule("Game Log")
+                run_action(
+                    "season_stats",
+                    get_player_season_stats,
+                    playerID,
+                    [season.strip() for season in seasons.split(',') if season.strip()],
+                    start_date.strip() or None,
+                    end_date.strip() or None,
+                    int(window) if window.strip().isdigit() and int(window) > 0 else 7
+                )
+            elif option2 == '5':
                 continue
             Prompt.ask("\nPress Enter to continue...")
         else:
@@ -0,0 +1,389 @@
+"""
+Typed models for Tank01 payloads and the parsers that build them. Stats come
+from the API as strings, here they are stored as ints/floats in slotted dataclasses.
+"""
+from dataclasses import dataclass, field
+
+
+def to_int(value, default=0):
+    """'3' -> 3, and anything blank or malformed ('', None, '-') -> default."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return default
+
+
+def to_float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def innings_to_outs(ip):
+    """Innings pitched as the API writes it ("6.1" = 6 1/3) -> total outs (19)."""
+    whole, _, partial = str(ip or '0').partition('.')
+    return to_int(whole) * 3 + to_int(partial[:1])
+
+
+def outs_to_innings(outs):
+    """Total outs back to the "6.1" notation."""
+    return f"{outs // 3}.{outs % 3}"
+
+
+def format_avg(value):
+    """0.25 -> '.250', 1.0 -> '1.000'"""
+    text = f"{value:.3f}"
+    return text[1:] if text.startswith('0') else text
+
+
+@dataclass(slots=True)
+class BattingLine:
+    ab: int = 0
+    h: int = 0
+    r: int = 0
+    rbi: int = 0
+    bb: int = 0
+    so: int = 0
+    hr: int = 0
+    doubles: int = 0
+    triples: int = 0
+    hbp: int = 0
+    sf: int = 0
+    sb: int = 0
+    cs: int = 0
+
+    @property
+    def avg(self):
+        return self.h / self.ab if self.ab else 0.0
+
+    @property
+    def total_bases(self):
+        return self.h + self.doubles + 2 * self.triples + 3 * self.hr
+
+    @property
+    def obp(self):
+        plate_appearances = self.ab + self.bb + self.hbp + self.sf
+        return (self.h + self.bb + self.hbp) / plate_appearances if plate_appearances else 0.0
+
+    @property
+    def slg(self):
+        return self.total_bases / self.ab if self.ab else 0.0
+
+    @property
+    def ops(self):
+        return self.obp + self.slg
+
+
+@dataclass(slots=True)
+class PitchingLine:
+    outs: int = 0
+    h: int = 0
+    r: int = 0
+    er: int = 0
+    bb: int = 0
+    so: int = 0
+    hr: int = 0
+    pitches: int = 0
+    win: int = 0
+    loss: int = 0
+    save: int = 0
+
+    @property
+    def ip(self):
+        return outs_to_innings(self.outs)
+
+
+@dataclass(slots=True)
+class TeamStats:
+    batting: BattingLine
+    pitching: PitchingLine
+    errors: int = 0
+    passed_balls: int = 0
+
+
+@dataclass(slots=True)
+class LineScore:
+    team: str
+    runs: int = 0
+    hits: int = 0
+    errors: int = 0
+    innings: tuple = ()  # runs per inning as displayed ('X' when the home team didn't bat)
+
+
+@dataclass(slots=True)
+class PlayerGameLine:
+    player_id: str
+    team: str
+    name: str = ''
+    position: str = ''
+    batting: BattingLine = None
+    pitching: PitchingLine = None
+    fantasy_points: float = 0.0
+
+
+@dataclass(slots=True)
+class BoxScore:
+    game_id: str
+    away: str
+    home: str
+    status_code: str = ''
+    venue: str = 'N/A'
+    weather: str = 'N/A'
+    first_pitch: str = 'N/A'
+    game_length: str = 'N/A'
+    attendance: str = 'N/A'
+    away_line: LineScore = None
+    home_line: LineScore = None
+    away_stats: TeamStats = None
+    home_stats: TeamStats = None
+    players: list = field(default_factory=list)
+    away_lineup: tuple = ()  # starting lineup player IDs in batting order
+    home_lineup: tuple = ()
+    away_probable: str = ''  # probable/starting pitcher player IDs
+    home_probable: str = ''
+
+    @property
+    def is_final(self):
+        return self.status_code == "2"
+
+
+@dataclass(slots=True)
+class ScoreboardGame:
+    game_id: str
+    away: str
+    home: str
+    away_runs: int = 0
+    home_runs: int = 0
+    status_code: str = ''
+    current_inning: str = ''
+    current_outs: str = ''
+    away_probable: str = ''
+    home_probable: str = ''
+
+    @property
+    def is_final(self):
+        return self.status_code == "2"
+
+    @property
+    def is_live(self):
+        return self.status_code == "1"
+
+
+@dataclass(slots=True)
+class RosterPlayer:
+    player_id: str
+    name: str
+    team: str = ''
+    position: str = ''
+
+
+@dataclass(slots=True)
+class GameLogEntry:
+    game_id: str
+    date: str
+    team: str
+    position: str
+    batting: BattingLine
+
+
+def parse_batting(hitting, base_running=None):
+    hitting = hitting or {}
+    base_running = base_running or {}
+    return BattingLine(
+        ab=to_int(hitting.get('AB')),
+        h=to_int(hitting.get('H')),
+        r=to_int(hitting.get('R')),
+        rbi=to_int(hitting.get('RBI')),
+        bb=to_int(hitting.get('BB')),
+        so=to_int(hitting.get('SO', hitting.get('K'))),
+        hr=to_int(hitting.get('HR')),
+        doubles=to_int(hitting.get('2B')),
+        triples=to_int(hitting.get('3B')),
+        hbp=to_int(hitting.get('HBP')),
+        sf=to_int(hitting.get('SF')),
+        sb=to_int(base_running.get('SB')),
+        cs=to_int(base_running.get('CS'))
+    )
+
+
+def parse_pitching(pitching):
+    pitching = pitching or {}
+    return PitchingLine(
+        outs=innings_to_outs(pitching.get('InningsPitched', pitching.get('IP'))),
+        h=to_int(pitching.get('H')),
+        r=to_int(pitching.get('R')),
+        er=to_int(pitching.get('ER')),
+        bb=to_int(pitching.get('BB')),
+        so=to_int(pitching.get('SO')),
+        hr=to_int(pitching.get('HR')),
+        pitches=to_int(pitching.get('Pitches')),
+        win=to_int(pitching.get('Win')),
+        loss=to_int(pitching.get('Loss')),
+        save=to_int(pitching.get('Save'))
+    )
+
+
+def parse_team_stats(team_stats):
+    if not team_stats:
+        return None
+    return TeamStats(
+        batting=parse_batting(team_stats.get('Hitting'), team_stats.get('BaseRunning')),
+        pitching=parse_pitching(team_stats.get('Pitching')),
+        errors=to_int((team_stats.get('Fielding') or {}).get('E')),
+        passed_balls=to_int((team_stats.get('Fielding') or {}).get('Passed Ball'))
+    )
+
+
+def parse_line_score(line, team):
+    line = line or {}
+    by_inning = line.get('scoresByInning') or {}
+    max_inning = max((to_int(k) for k in by_inning), default=0)
+    return LineScore(
+        team=team,
+        runs=to_int(line.get('R')),
+        hits=to_int(line.get('H')),
+        errors=to_int(line.get('E')),
+        innings=tuple(str(by_inning.get(str(i), ' ')) for i in range(1, max_inning + 1))
+    )
+
+
+def parse_player_line(player):
+    hitting = player.get('Hitting')
+    pitching = player.get('Pitching')
+    return PlayerGameLine(
+        player_id=str(player.get('playerID', '')),
+        team=player.get('team', ''),
+        name=player.get('longName', ''),
+        position=player.get('startingPosition') or player.get('allPositionsPlayed', ''),
+        batting=parse_batting(hitting, player.get('BaseRunning')) if hitting else None,
+        pitching=parse_pitching(pitching) if pitching else None,
+        fantasy_points=to_float(player.get('fantasyPoints'))
+    )
+
+
+def parse_probables(game_info):
+    """(away, home) probable starting pitcher IDs, blank when not announced."""
+    probables = game_info.get('probableStartingPitchers') or {}
+    if not isinstance(probables, dict):
+        return '', ''
+    return str(probables.get('away') or ''), str(probables.get('home') or '')
+
+
+def parse_lineup(lineup):
+    """Player IDs from a startingLineups entry, sorted by batting order."""
+    if not isinstance(lineup, list):
+        return ()
+    batters = [p for p in lineup if isinstance(p, dict) and p.get('playerID')]
+    batters.sort(key=lambda p: to_int(p.get('battingOrder'), 99))
+    return tuple(str(p['playerID']) for p in batters)
+
+
+def parse_box_score(body, game_id=''):
+    """Parse the body of a getMLBBoxScore response."""
+    if not isinstance(body, dict) or not body:
+        return None
+    away = body.get('away', 'Away')
+    home = body.get('home', 'Home')
+    line_score = body.get('lineScore') or {}
+    team_stats = body.get('teamStats') or {}
+
+    player_stats = body.get('playerStats') or []
+    if isinstance(player_stats, dict):  # playerStatsFormat other than "list"
+        player_stats = list(player_stats.values())
+
+    lineups = body.get('startingLineups') or {}
+    if not isinstance(lineups, dict):
+        lineups = {}
+    away_probable, home_probable = parse_probables(body)
+
+    return BoxScore(
+        game_id=body.get('gameID', game_id),
+        away=away,
+        home=home,
+        status_code=str(body.get('gameStatusCode', '2' if body.get('gameStatus') in ('Final', 'Completed') else '')),
+        venue=body.get('Venue', 'N/A'),
+        weather=body.get('Weather', 'N/A'),
+        first_pitch=body.get('FirstPitch', 'N/A'),
+        game_length=body.get('GameLength', 'N/A'),
+        attendance=body.get('Attendance', 'N/A'),
+        away_line=parse_line_score(line_score.get('away'), away),
+        home_line=parse_line_score(line_score.get('home'), home),
+        away_stats=parse_team_stats(team_stats.get('away')),
+        home_stats=parse_team_stats(team_stats.get('home')),
+        players=[parse_player_line(p) for p in player_stats if isinstance(p, dict)],
+        away_lineup=parse_lineup(lineups.get('away')),
+        home_lineup=parse_lineup(lineups.get('home')),
+        away_probable=away_probable,
+        home_probable=home_probable
+    )
+
+
+def parse_scoreboard(body):
+    """Parse the body of a getMLBScoresOnly response into games, in API order."""
+    games = []
+    if not isinstance(body, dict):
+        return games
+    for game_id, game_info in body.items():
+        if not isinstance(game_info, dict):
+            continue
+        line_score = game_info.get('lineScore') or {}
+        away_probable, home_probable = parse_probables(game_info)
+        games.append(ScoreboardGame(
+            game_id=game_id,
+            away=game_info.get('away', 'N/A'),
+            home=game_info.get('home', 'N/A'),
+            away_runs=to_int((line_score.get('away') or {}).get('R')),
+            home_runs=to_int((line_score.get('home') or {}).get('R')),
+            status_code=str(game_info.get('gameStatusCode', '')),
+            current_inning=game_info.get('currentInning', ''),
+            current_outs=game_info.get('currentOuts', ''),
+            away_probable=away_probable,
+            home_probable=home_probable
+        ))
+    return games
+
+
+def parse_roster(players):
+    """Parse the body of a getMLBPlayerList response."""
+    return [
+        RosterPlayer(
+            player_id=str(player.get('playerID', '')),
+            name=player.get('longName', ''),
+            team=player.get('team', ''),
+            position=player.get('pos', '')
+        )
+        for player in players or []
+        if isinstance(player, dict)
+    ]
+
+
+def parse_game_log(body):
+    """Parse the body of a getMLBGamesForPlayer response, in API order."""
+    entries = []
+    if not isinstance(body, dict):
+        return entries
+    for game_id, game_data in body.items():
+        if not isinstance(game_data, dict):
+            continue
+        entries.append(GameLogEntry(
+            game_id=game_id,
+            date=game_id.split('_')[0],
+            team=game_data.get('team', 'N/A'),
+            position=game_data.get('startingPosition', 'N/A'),
+            batting=parse_batting(game_data.get('Hitting'), game_data.get('BaseRunning'))
+        ))
+    return entries
+
+
+def parse_matchup(body):
+    """Batting line from a getMLBBatterVsPitcher body, or None if they've never faced."""
+    if not isinstance(body, dict) or 'opponents' not in body:
+        return None
+    opponents = body.get('opponents') or []
+    if not opponents:
+        return BattingLine()
+    return parse_batting(opponents[0].get('stats'))
@@ -0,0 +1,162 @@
+import re
+import unicodedata
+from collections import deque
+
+# Name suffixes that people usually leave off when searching
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+
+def normalize_name(name):
+    """
+    Fold a player name down to a lookup key: strip accents, lowercase, drop
+    punctuation and generational suffixes. "Ronald Acuña Jr." -> "ronald acuna"
+    """
+    if not name:
+        return ''
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r"[^a-z0-9 ]", ' ', name.lower())
+    tokens = [t for t in name.split() if t not in NAME_SUFFIXES]
+    return ' '.join(tokens)
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """
+    Levenshtein distance between a and b, giving up (returns max_distance + 1)
+    as soon as every cell in a row is already over the limit.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class PlayerNotFound(LookupError):
+    """No player goes by `name`. `suggestions` are the closest RosterPlayers, if any."""
+
+    def __init__(self, name, suggestions=()):
+        self.name = name
+        self.suggestions = list(suggestions)
+        names = ', '.join(player.name for player in self.suggestions)
+        super().__init__(f"player '{name}' not found" + (f" (did you mean: {names})" if names else ''))
+
+
+class PlayerIndex:
+    """
+    Lookup tables built once per roster snapshot so that searching by name,
+    ID or team doesn't have to scan the whole player list every time.
+    `players` is a list of models.RosterPlayer.
+    """
+
+    def __init__(self, players, version=0):
+        self.version = version
+        self.players = players or []
+        self._by_name = {}
+        self._by_id = {}
+        self._by_team = {}
+        self._trie = {}
+
+        for player in self.players:
+            key = normalize_name(player.name)
+            player_id = player.player_id
+            team = player.team
+
+            if key:
+                self._by_name.setdefault(key, []).append(player)
+            if player_id:
+                self._by_id[str(player_id)] = player
+            if team:
+                self._by_team.setdefault(team.upper(), []).append(player)
+
+            # Index the full name and every token so "ohta" finds Shohei Ohtani
+            tokens = key.split()
+            for start in range(len(tokens)):
+                self._add_to_trie(' '.join(tokens[start:]), key)
+
+    def __len__(self):
+        return len(self.players)
+
+    def find(self, name):
+        """Return the first player whose normalized name matches exactly, or None."""
+        matches = self._by_name.get(normalize_name(name))
+        return matches[0] if matches else None
+
+    def find_all(self, name):
+        """Return every player sharing this normalized name (there are a few duplicates)."""
+        return list(self._by_name.get(normalize_name(name), []))
+
+    def by_id(self, player_id):
+        return self._by_id.get(str(player_id))
+
+    def by_team(self, team):
+        return list(self._by_team.get((team or '').upper(), []))
+
+    def prefix(self, text, limit=10):
+        """Return up to `limit` players whose name (or any later part of it) starts with `text`."""
+        node = self._trie
+        for char in normalize_name(text):
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Breadth first so shorter (closer) names come out first
+        keys = []
+        queue = deque([node])
+        while queue and len(keys) < limit:
+            current = queue.popleft()
+            for key in sorted(current.get('$', ())):
+                if key not in keys:
+                    keys.append(key)
+            queue.extend(child for char, child in sorted(current.items()) if char != '$')
+
+        results = []
+        for key in keys[:limit]:
+            results.extend(self._by_name[key])
+        return results[:limit]
+
+    def fuzzy(self, name, limit=5, max_distance=None):
+        """
+        Rank players by edit distance to `name`. max_distance defaults to
+        roughly one typo per three letters.
+        """
+        target = normalize_name(name)
+        if not target:
+            return []
+        if max_distance is None:
+            max_distance = max(1, len(target) // 3)
+
+        scored = []
+        for key, players in self._by_name.items():
+            distance = bounded_edit_distance(target, key, max_distance)
+            if distance <= max_distance:
+                scored.extend((distance, key, player) for player in players)
+
+        scored.sort(key=lambda item: (item[0], item[1]))
+        return [player for _, _, player in scored[:limit]]
+
+    def suggest(self, name, limit=5):
+        """'Did you mean' candidates: prefix matches first, then fuzzy matches."""
+        suggestions = []
+        seen = set()
+        for player in self.prefix(name, limit) + self.fuzzy(name, limit):
+            if player.player_id not in seen:
+                seen.add(player.player_id)
+                suggestions.append(player)
+        return suggestions[:limit]
+
+    def _add_to_trie(self, text, key):
+        node = self._trie
+        for char in text:
+            node = node.setdefault(char, {})
+        node.setdefault('$', set()).add(key)
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from quota import BACKGROUND, QUOTA, request_priority
+from response_cache import make_key
+from util_methods import (
+    ROSTER_CACHE,
+    RESPONSE_CACHE,
+    WAREHOUSE,
+    box_score_query,
+    scoreboard_query,
+    fetch_box_score,
+    fetch_scoreboard,
+    get_player_index
+)
+
+# Most API calls the prefetcher may spend per hour, 0 turns it off
+PREFETCH_BUDGET = int(os.getenv('PREFETCH_BUDGET', '20'))
+
+# Share of the monthly quota above the reserve the prefetcher may use, spread
+# evenly over the time left until the quota resets
+PREFETCH_QUOTA_SHARE = float(os.getenv('PREFETCH_QUOTA_SHARE', '0.25'))
+
+
+class Prefetcher:
+    """
+    Background worker that warms the caches while the menu is waiting for
+    input: the roster, a day's scoreboard and the box scores of its live and
+    Final games. Only data that was never fetched is warmed, live data that
+    has expired is left for the user's own request. Tasks whose data is
+    already cached are free, anything else spends one call from an hourly
+    budget, which is cut to a share of the monthly quota left (see
+    allowance), and is dropped once it runs out or the monthly quota is down
+    to its interactive reserve. Calls go out at BACKGROUND priority, behind
+    anything the user is waiting on.
+    """
+
+    def __init__(self, budget=PREFETCH_BUDGET, window=3600):
+        self.budget = budget
+        self.window = window
+        self.spent = deque()  # timestamps of calls made in the last window
+        self.completed = 0
+        self.dropped = 0
+        self._tasks = deque()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.budget <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    @contextmanager
+    def busy(self):
+        """Hold off prefetching while the user's own request is running."""
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._idle.set()
+
+    def allowance(self):
+        """
+        Calls allowed per window: the budget, or less when PREFETCH_QUOTA_SHARE
+        of the quota above the reserve, spread over the windows left until it
+        resets, comes to less. 0 on the free tier, where the menu's own requests
+        need every call.
+        """
+        spare = QUOTA.remaining() - QUOTA.limit * QUOTA.reserve
+        windows_left = max(1.0, QUOTA.seconds_left() / self.window)
+        return max(0, min(self.budget, int(spare * PREFETCH_QUOTA_SHARE / windows_left)))
+
+    def remaining(self):
+        """API calls left in the current budget window."""
+        allowance = self.allowance()
+        with self._lock:
+            self._expire_spent()
+            return max(0, allowance - len(self.spent))
+
+    def schedule(self, key, func, *args, cached=None):
+        """
+        Queue func(*args) to run when idle, unless a task with the same key is
+        already waiting. cached() should say whether it can run without an API call.
+        """
+        if self.budget <= 0:
+            return
+        with self._lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+            self._tasks.append((key, func, args, cached))
+        self._wakeup.set()
+
+    # ----- WARMING ------------------
+
+    def warm_today(self):
+        """The roster and today's scoreboard (plus its live/Final box scores)."""
+        self.schedule('roster', get_player_index,
+                      cached=lambda: ROSTER_CACHE.players is not None and ROSTER_CACHE.is_fresh())
+        self.warm_scoreboard(datetime.now().strftime("%Y%m%d"))
+
+    def warm_scoreboard(self, date):
+        """A day's scoreboard, then the box scores of the games that have any."""
+        key = make_key("getMLBScoresOnly", scoreboard_query(date))
+        if RESPONSE_CACHE.is_expired(key):
+            return
+        self.schedule(('scoreboard', date), self._warm_games, date,
+                      cached=lambda: WAREHOUSE.is_date_ingested(date) or RESPONSE_CACHE.contains(key))
+
+    def warm_box_score(self, game_id):
+        key = make_key("getMLBBoxScore", box_score_query(game_id))
+        if RESPONSE_CACHE.is_expired(key):
+            return
+        self.schedule(('box_score', game_id), fetch_box_score, game_id,
+                      cached=lambda: WAREHOUSE.has_game(game_id) or RESPONSE_CACHE.contains(key))
+
+    def _warm_games(self, date):
+        games = fetch_scoreboard(date)
+        # Live games are the likeliest pick, games that haven't started have no box score yet
+        for game in sorted(games, key=lambda game: not game.is_live):
+            if game.is_live or game.is_final:
+                self.warm_box_score(game.game_id)
+
+    # ----- WORKER ------------------
+
+    def _expire_spent(self):
+        cutoff = time.time() - self.window
+        while self.spent and self.spent[0] < cutoff:
+            self.spent.popleft()
+
+    def _spend(self):
+        allowance = self.allowance()
+        with self._lock:
+            self._expire_spent()
+            if len(self.spent) >= allowance:
+                return False
+            self.spent.append(time.time())
+            return True
+
+    def _next_task(self):
+        with self._lock:
+            if not self._tasks:
+                self._wakeup.clear()
+                return None
+            key, func, args, cached = self._tasks.popleft()
+            self._queued.discard(key)
+            return func, args, cached
+
+    def _run(self):
+        while not self._stop.is_set():
+            task = self._next_task()
+            if task is None:
+                self._wakeup.wait()
+                continue
+
+            self._idle.wait()
+            func, args, cached = task
+            if not (cached and cached()) and not (QUOTA.allow(BACKGROUND) and self._spend()):
+                self.dropped += 1
+                continue
+            # Warming is best effort, a failure just means the user waits as before
+            try:
+                with request_priority(BACKGROUND):
+                    func(*args)
+                self.completed += 1
+            except Exception:
+                pass
+
+
+PREFETCHER = Prefetcher()
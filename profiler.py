@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from rich.panel import Panel
+from rich.table import Table
+
+# Spans kept in memory before the oldest ones are dropped
+MAX_SPANS = int(os.getenv('PROFILE_MAX_SPANS', '20000'))
+
+
+class Span:
+    """One timed step: an API call, a JSON decode, a cache lookup or a render."""
+
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_id', 'start', 'end', 'attributes', 'thread')
+
+    def __init__(self, name, kind, trace_id, span_id, parent_id, attributes):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.time_ns()
+        self.end = None
+        self.attributes = attributes
+        self.thread = threading.current_thread().name
+
+    @property
+    def duration_ms(self):
+        return ((self.end or time.time_ns()) - self.start) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def as_otel(self):
+        """The span in OpenTelemetry's OTLP/JSON shape."""
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id or '',
+            'name': self.name,
+            'kind': 3 if self.kind == 'http' else 1,  # SPAN_KIND_CLIENT / SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end or self.start),
+            'attributes': [_otel_attribute(key, value) for key, value in self.attributes.items()]
+        }
+
+
+def _otel_attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class _NoSpan:
+    """Stand-in yielded while profiling is off, so callers can always call .set()."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Profiler:
+    """
+    Records timed spans around API calls, cache lookups, JSON decoding and
+    rendering. Each menu action or CLI command is one trace; spans opened on
+    worker threads attach to the action that is running. Costs next to nothing
+    while disabled.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._action = None
+        self._ids = 0
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        with self._lock:
+            self.spans = []
+
+    def _next_id(self, width):
+        with self._lock:
+            self._ids += 1
+            return f"{os.getpid():08x}{self._ids:0{width - 8}x}"[-width:]
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, kind='internal', **attributes):
+        """Time the enclosed block as a span nested under whatever span is open."""
+        if not self.enabled:
+            yield _NO_SPAN
+            return
+
+        stack = self._stack()
+        parent = stack[-1] if stack else self._action
+        trace_id = parent.trace_id if parent else self._next_id(32)
+        span = Span(name, kind, trace_id, self._next_id(16), parent.span_id if parent else None, attributes)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=type(e).__name__)
+            raise
+        finally:
+            span.end = time.time_ns()
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+                if len(self.spans) > MAX_SPANS:
+                    del self.spans[:len(self.spans) - MAX_SPANS]
+
+    @contextmanager
+    def action(self, name, **attributes):
+        """Start a new trace for one user action; spans on any thread attach to it."""
+        if not self.enabled:
+            yield _NO_SPAN
+            return
+
+        with self.span(name, **attributes) as span:
+            self._action = span
+            try:
+                yield span
+            finally:
+                self._action = None
+
+    def trace(self, trace_id):
+        with self._lock:
+            return [span for span in self.spans if span.trace_id == trace_id]
+
+    def summary(self, spans=None):
+        """
+        Aggregate spans by name: count, total/max ms, bytes, cache hits/misses
+        and retries.
+        """
+        spans = self.spans if spans is None else spans
+        rows = {}
+        for span in spans:
+            row = rows.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'bytes': 0,
+                                              'hits': 0, 'misses': 0, 'retries': 0, 'errors': 0})
+            duration = span.duration_ms
+            row['count'] += 1
+            row['total_ms'] += duration
+            row['max_ms'] = max(row['max_ms'], duration)
+            row['bytes'] += span.attributes.get('bytes', 0)
+            if 'cache_hit' in span.attributes:
+                row['hits' if span.attributes['cache_hit'] else 'misses'] += 1
+            if span.attributes.get('attempt', 0) > 0:
+                row['retries'] += 1
+            if 'error' in span.attributes or span.attributes.get('http.status_code', 0) >= 400:
+                row['errors'] += 1
+        return rows
+
+    def summary_panel(self, spans=None, title="Profile"):
+        """Rich panel breaking down where the time went."""
+        spans = self.spans if spans is None else spans
+        table = Table(expand=False, box=None)
+        table.add_column("Step", style="cyan")
+        table.add_column("Count", justify="right")
+        table.add_column("Total ms", justify="right", style="bold")
+        table.add_column("Max ms", justify="right")
+        table.add_column("KB", justify="right")
+        table.add_column("Cache hit/miss", justify="center")
+        table.add_column("Retries", justify="right", style="yellow")
+        table.add_column("Errors", justify="right", style="red")
+
+        rows = self.summary(spans)
+        for name, row in sorted(rows.items(), key=lambda item: -item[1]['total_ms']):
+            cache = f"{row['hits']}/{row['misses']}" if row['hits'] or row['misses'] else ""
+            table.add_row(
+                name,
+                str(row['count']),
+                f"{row['total_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+                f"{row['bytes'] / 1024:.1f}" if row['bytes'] else "",
+                cache,
+                str(row['retries']) if row['retries'] else "",
+                str(row['errors']) if row['errors'] else ""
+            )
+
+        roots = [span for span in spans if span.parent_id is None]
+        wall = sum(span.duration_ms for span in roots)
+        return Panel(table, title=title, subtitle=f"{wall:.1f} ms wall", border_style="magenta")
+
+    def export(self, path):
+        """Write every recorded span as an OTLP/JSON trace file (one resourceSpans batch)."""
+        with self._lock:
+            spans = list(self.spans)
+        document = {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otel_attribute('service.name', 'MLBStatFinder')]},
+                'scopeSpans': [{
+                    'scope': {'name': 'mlbstatfinder.profiler'},
+                    'spans': [span.as_otel() for span in spans]
+                }]
+            }]
+        }
+        with open(path, 'w') as f:
+            json.dump(document, f, indent=1)
+        return len(spans)
+
+
+def parse_profile_args(argv):
+    """
+    Pull --profile and --trace FILE out of an argument list. Returns
+    (remaining args, profile enabled, trace path).
+    """
+    remaining, enabled, trace_path = [], False, None
+    args = iter(argv)
+    for arg in args:
+        if arg == '--profile':
+            enabled = True
+        elif arg == '--trace':
+            trace_path = next(args, None)
+            enabled = True
+        elif arg.startswith('--trace='):
+            trace_path = arg.split('=', 1)[1]
+            enabled = True
+        else:
+            remaining.append(arg)
+    return remaining, enabled, trace_path
+
+
+PROFILER = Profiler(enabled=os.getenv('MLB_PROFILE', '') not in ('', '0'))
@@ -0,0 +1,203 @@
+"""
+Monthly API quota accounting and request priorities. Every call sent to
+Tank01 is counted against the plan's monthly quota and the count is saved
+to disk, so it carries over between runs. Background work (prefetching,
+roster refreshes) stops once usage reaches the reserve kept for the user's
+own requests. Nothing at all is sent once the quota is used up.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Kept next to the other caches, see roster_cache.CACHE_DIR
+QUOTA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'quota.json')
+
+# Calls per month on the RapidAPI plan (the free tier is 1000). The x-ratelimit
+# headers on each response override it once one has been seen.
+MONTHLY_QUOTA = int(os.getenv('TANK01_MONTHLY_QUOTA', '1000'))
+
+# Share of the quota held back for interactive requests. Below it background
+# work stops and cached data is served even when it has expired.
+QUOTA_RESERVE = float(os.getenv('QUOTA_RESERVE', '0.1'))
+
+# Request priorities, lower goes first (see TokenBucket.acquire)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_local = threading.local()
+
+
+def current_priority():
+    """Priority of API calls made from this thread, INTERACTIVE unless set otherwise."""
+    return getattr(_local, 'priority', INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    """Make API calls from this thread at `priority` inside the block."""
+    previous = current_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+class QuotaExhausted(Exception):
+    """Raised instead of sending an API call the quota can't cover."""
+
+
+def _period():
+    return datetime.now().strftime("%Y-%m")
+
+
+class QuotaLedger:
+    """
+    API calls used in the current quota period, persisted to `path`. The
+    local count is corrected from RapidAPI's x-ratelimit-requests-* headers
+    whenever a response carries them.
+    """
+
+    def __init__(self, limit=MONTHLY_QUOTA, path=QUOTA_FILE, reserve=QUOTA_RESERVE, save_interval=2.0):
+        self.configured_limit = limit
+        self.reported_limit = None  # from the x-ratelimit-requests-limit header, wins over the setting
+        self.path = path
+        self.reserve = reserve
+        self.save_interval = save_interval
+        self.used = 0
+        self.period = _period()
+        self.reset_at = None  # when RapidAPI said the quota resets, if it did
+        self.denied = 0
+        self._loaded = False
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        return self.reported_limit or self.configured_limit
+
+    def remaining(self):
+        with self._lock:
+            self._refresh()
+            return max(0, self.limit - self.used)
+
+    def seconds_left(self):
+        """Seconds until the quota resets: RapidAPI's reset time if it gave one, else the end of the month."""
+        with self._lock:
+            self._refresh()
+            if self.reset_at is not None:
+                return max(0.0, self.reset_at - time.time())
+        now = datetime.now()
+        next_month = datetime(now.year + now.month // 12, now.month % 12 + 1, 1)
+        return (next_month - now).total_seconds()
+
+    def is_low(self):
+        """True once usage is into the interactive reserve."""
+        return self.remaining() <= self.limit * self.reserve
+
+    def allow(self, priority=None):
+        """Whether a call at `priority` (default: this thread's) may be sent now."""
+        priority = current_priority() if priority is None else priority
+        remaining = self.remaining()
+        if priority >= BACKGROUND:
+            return remaining > self.limit * self.reserve
+        return remaining > 0
+
+    def check(self, endpoint, priority=None):
+        """Raise QuotaExhausted unless a call at `priority` may be sent."""
+        if not self.allow(priority):
+            with self._lock:
+                self.denied += 1
+            raise QuotaExhausted(
+                f"Not enough API quota left to call {endpoint} ({self.remaining()} of {self.limit} calls "
+                f"left this month), only cached data is available"
+            )
+
+    def spend(self, calls=1):
+        with self._lock:
+            self._refresh()
+            self.used += calls
+            self._dirty = True
+            self._save_if_due()
+
+    def observe(self, limit=None, remaining=None, reset_seconds=None):
+        """Take the counts RapidAPI reported in a response's headers as the truth."""
+        with self._lock:
+            self._refresh()
+            if limit:
+                self.reported_limit = limit
+            if remaining is not None:
+                self.used = max(0, self.limit - remaining)
+            if reset_seconds:
+                self.reset_at = time.time() + reset_seconds
+            self._dirty = True
+            self._save_if_due()
+
+    def as_dict(self):
+        remaining = self.remaining()
+        return {
+            'period': self.period,
+            'limit': self.limit,
+            'used': self.used,
+            'remaining': remaining,
+            'low': remaining <= self.limit * self.reserve,
+            'denied': self.denied
+        }
+
+    def flush(self):
+        """Save now if anything changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    # ----- STORAGE ------------------
+
+    def _refresh(self):
+        if not self._loaded:
+            self._load()
+        # A new period starts from zero: at the reset time RapidAPI gave, otherwise each calendar month
+        if self.reset_at is not None:
+            if time.time() >= self.reset_at:
+                self.used, self.reset_at, self.period = 0, None, _period()
+                self._dirty = True
+        elif self.period != _period():
+            self.used, self.period = 0, _period()
+            self._dirty = True
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.period = saved.get('period', self.period)
+        self.used = saved.get('used', 0)
+        self.reported_limit = saved.get('reported_limit')
+        self.reset_at = saved.get('reset_at')
+
+    def _save_if_due(self):
+        if time.time() - self._saved_at >= self.save_interval:
+            self._save()
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'period': self.period, 'used': self.used, 'reported_limit': self.reported_limit,
+                           'reset_at': self.reset_at}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self._saved_at = time.time()
+        except OSError:
+            pass
+
+
+QUOTA = QuotaLedger()
+atexit.register(QUOTA.flush)
@@ -0,0 +1,177 @@
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from requests import HTTPError
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from response_cache import make_key
+from tank01_client import BASE_URL
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def request_key(request):
+    """Fixture key for a prepared request: endpoint + sorted querystring."""
+    url = urlsplit(request.url)
+    endpoint = url.path.rsplit('/', 1)[-1]
+    return make_key(endpoint, dict(parse_qsl(url.query, keep_blank_values=True)))
+
+
+def fixture_path(directory, key):
+    endpoint = key.split('?', 1)[0]
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, endpoint, digest + '.json.gz')
+
+
+def save_fixture(directory, key, payload):
+    path = fixture_path(directory, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump({'key': key, 'payload': payload}, f, separators=(',', ':'))
+
+
+def load_fixtures(directory):
+    """Read every recorded payload in `directory` into {key: raw JSON bytes}."""
+    fixtures = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.json.gz'):
+                with gzip.open(os.path.join(root, name), 'rt', encoding='utf-8') as f:
+                    entry = json.load(f)
+                fixtures[entry['key']] = json.dumps(entry['payload'], separators=(',', ':')).encode('utf-8')
+    return fixtures
+
+
+class NotRecorded(HTTPError):
+    """Raised by a strict ReplayAdapter for a call it has nothing recorded for."""
+
+
+def _response(request, status, body, headers=None, reason=None):
+    response = Response()
+    response.status_code = status
+    response.reason = reason
+    response._content = body
+    response._content_consumed = True
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.headers.setdefault('Content-Type', 'application/json')
+    response.encoding = 'utf-8'
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    requests transport adapter that answers Tank01 calls from recorded payloads
+    instead of the network, with optional injected latency and 429s. Mount it on
+    the client session: client.session.mount(BASE_URL, adapter).
+    """
+
+    def __init__(self, fixtures, latency=0.0, jitter=0.0, rate_limit_every=0, strict=False,
+                 source="the recorded fixtures"):
+        super().__init__()
+        self.fixtures = fixtures  # {key: raw JSON bytes}
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every  # answer every Nth call with a 429
+        self.strict = strict  # NotRecorded on unknown keys instead of an empty body
+        self.source = source  # what the fixtures came from, for the NotRecorded message
+        self.calls = 0
+        self.bytes_sent = 0
+        self.misses = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, directory=FIXTURES_DIR, **kwargs):
+        return cls(load_fixtures(directory), **kwargs)
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+
+        if self.latency or self.jitter:
+            time.sleep(self.latency + random.uniform(0, self.jitter))
+
+        if self.rate_limit_every and call_number % self.rate_limit_every == 0:
+            return _response(request, 429, b'{"message":"Too many requests"}', {'Retry-After': '0'})
+
+        key = request_key(request)
+        body = self.lookup(key)
+        if body is None:
+            with self._lock:
+                self.misses.append(key)
+            if self.strict:
+                raise NotRecorded(f"{key} is not in {self.source}", request=request)
+            body = b'{"statusCode":200,"body":{}}'
+
+        with self._lock:
+            self.bytes_sent += len(body)
+        return _response(request, 200, body)
+
+    def lookup(self, key):
+        """
+        Raw JSON body recorded for key. A game log asked for with a different
+        numberOfGames is cut from the longest log recorded for that player and
+        season, so one full season log answers every "last N games".
+        """
+        body = self.fixtures.get(key)
+        if body is not None or not key.startswith('getMLBGamesForPlayer?'):
+            return body
+
+        params = dict(parse_qsl(key.split('?', 1)[1]))
+        wanted = params.pop('numberOfGames', None)
+        payload = None
+        for candidate, candidate_body in self.fixtures.items():
+            if not candidate.startswith('getMLBGamesForPlayer?'):
+                continue
+            candidate_params = dict(parse_qsl(candidate.split('?', 1)[1]))
+            candidate_games = candidate_params.pop('numberOfGames', None)
+            if candidate_params != params or (candidate_games and wanted and int(candidate_games) < int(wanted)):
+                continue
+            candidate_payload = json.loads(candidate_body)
+            if payload is None or len(candidate_payload.get('body') or {}) > len(payload.get('body') or {}):
+                payload = candidate_payload
+        if payload is None:
+            return None
+
+        games = payload.get('body')
+        if wanted and isinstance(games, dict):
+            # Game IDs start with the date, keep the newest in the order they were recorded
+            newest = set(sorted(games, reverse=True)[:int(wanted)])
+            payload = dict(payload, body={game_id: game for game_id, game in games.items() if game_id in newest})
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+    def close(self):
+        pass
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that saves every successful JSON response as a fixture while passing it through."""
+
+    def __init__(self, directory=FIXTURES_DIR, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            try:
+                save_fixture(self.directory, request_key(request), response.json())
+            except ValueError:
+                pass
+        return response
+
+
+def install(client, adapter):
+    """Route every Tank01 request made by `client` through `adapter`."""
+    client.session.mount(BASE_URL, adapter)
+    return adapter
@@ -0,0 +1,214 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from profiler import PROFILER
+from quota import QuotaExhausted
+from roster_cache import CACHE_DIR
+
+RESPONSE_CACHE_DIR = os.path.join(CACHE_DIR, 'responses')
+
+# Returned by a TTL policy to keep an entry forever (memory and disk)
+PINNED = float('inf')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers that ask for a key while
+    its call is still running wait for it and share the result (or exception).
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def make_key(endpoint, params=None):
+    """Stable cache key for an endpoint + querystring."""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return endpoint + '?' + '&'.join(f"{k}={v}" for k, v in items)
+
+
+class ResponseCache:
+    """
+    LRU cache of decoded API payloads with a per-entry TTL. Entries with a
+    PINNED ttl (e.g. box scores for Final games) are also written to disk so
+    they never have to be fetched again, even after a restart. Concurrent
+    misses on the same key share a single upstream fetch. Expired entries are
+    kept until evicted, to be served stale when `quota` is running out.
+    """
+
+    def __init__(self, max_entries=256, directory=RESPONSE_CACHE_DIR, quota=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.quota = quota
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.recorder = None  # called as recorder(endpoint, params, payload) for every answer, see snapshot.py
+
+    @property
+    def coalesced(self):
+        """Misses that waited on another thread's fetch instead of making their own."""
+        return self._flights.coalesced
+
+    def get(self, key):
+        """Return the cached payload for key, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+
+        payload = self._load_pinned(key)
+        with self._lock:
+            if payload is not None:
+                self._store(key, PINNED, payload)
+                self.hits += 1
+            else:
+                self.misses += 1
+        return payload
+
+    def get_stale(self, key):
+        """The payload last cached for key even if it has expired, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def is_expired(self, key):
+        """True if key was cached but has expired (a live scoreboard or box score gone stale)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] <= time.time()
+
+    def contains(self, key):
+        """True if key would be served from cache, without counting a hit or loading it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                return True
+        return os.path.exists(self._path(key))
+
+    def set(self, key, payload, ttl):
+        if not ttl or ttl <= 0:
+            return
+        with self._lock:
+            self._store(key, time.time() + ttl, payload)
+        if ttl == PINNED:
+            self._save_pinned(key, payload)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_json(self, fetch, endpoint, params, ttl_policy):
+        """
+        Return the payload for endpoint+params from cache, or call
+        fetch(endpoint, params) and cache it for ttl_policy(payload) seconds.
+        """
+        key = make_key(endpoint, params)
+        with PROFILER.span("cache.lookup", endpoint=endpoint) as span:
+            payload = self.get(key)
+            span.set(cache_hit=payload is not None)
+        if payload is None and self.quota is not None and self.quota.is_low():
+            # An expired copy beats spending one of the last calls
+            payload = self.get_stale(key)
+        if payload is None:
+            try:
+                payload = self._flights.do(key, lambda: self._fetch(fetch, key, endpoint, params, ttl_policy))
+            except QuotaExhausted:
+                payload = self.get_stale(key)
+                if payload is None:
+                    raise
+        if self.recorder is not None:
+            self.recorder(endpoint, params, payload)
+        return payload
+
+    def _fetch(self, fetch, key, endpoint, params, ttl_policy):
+        payload = fetch(endpoint, params)
+        self.set(key, payload, ttl_policy(payload))
+        return payload
+
+    def _store(self, key, expires_at, payload):
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, digest + '.json.gz')
+
+    def _load_pinned(self, key):
+        try:
+            with gzip.open(self._path(key), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_pinned(self, key, payload):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
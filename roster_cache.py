@@ -0,0 +1,162 @@
+import gzip
+import json
+import os
+import threading
+import time
+
+from quota import BACKGROUND, current_priority, request_priority
+
+# Where the roster snapshot lives on disk (next to this file, not the CWD)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+ROSTER_CACHE_FILE = os.path.join(CACHE_DIR, 'roster.json.gz')
+
+# How long a roster snapshot is considered fresh (seconds). The player list
+# barely changes within a day so the default is a few hours.
+ROSTER_TTL = int(os.getenv('ROSTER_CACHE_TTL', str(6 * 60 * 60)))
+
+
+class RosterCache:
+    """
+    In-memory + on-disk cache for the getMLBPlayerList roster.
+
+    `fetch` is called as fetch(etag, last_modified) and must return a tuple
+    (players, etag, last_modified). If the server says nothing changed it
+    should return players=None and the current snapshot is kept.
+    """
+
+    def __init__(self, fetch, path=ROSTER_CACHE_FILE, ttl=ROSTER_TTL):
+        self._fetch = fetch
+        self.path = path
+        self.ttl = ttl
+        self.players = None
+        self.fetched_at = 0.0
+        self.etag = None
+        self.last_modified = None
+        self.version = 0  # bumped every time the player list actually changes
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._thread = None
+        self._stop = threading.Event()
+
+    def is_fresh(self):
+        return self.players is not None and (time.time() - self.fetched_at) < self.ttl
+
+    def get(self, block=True):
+        """
+        Return the cached roster list. Fresh data is returned right away, stale
+        data is returned right away while a refresh happens in the background,
+        and only an empty cache blocks on the network. With block=False an empty
+        cache starts a background download and returns None straight away.
+        """
+        if self.players is None:
+            self._load_from_disk()
+
+        if self.players is None:
+            if not block:
+                self._refresh_in_background()
+                return None
+            self.refresh(only_if_empty=True)
+        elif not self.is_fresh():
+            self._refresh_in_background()
+
+        return self.players
+
+    def refresh(self, only_if_empty=False):
+        """
+        Conditionally re-download the roster and save it to disk. With
+        only_if_empty a download that finished while waiting for the lock counts.
+        """
+        with self._lock:
+            if only_if_empty and self.players is not None:
+                return self.players
+            players, etag, last_modified = self._fetch(self.etag, self.last_modified)
+            if players is not None:
+                self.players = players
+                self.version += 1
+            self.etag = etag or self.etag
+            self.last_modified = last_modified or self.last_modified
+            self.fetched_at = time.time()
+            self._save_to_disk()
+        return self.players
+
+    def invalidate(self):
+        with self._lock:
+            self.players = None
+            self.fetched_at = 0.0
+            self.etag = None
+            self.last_modified = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def start_background_refresh(self, interval=None):
+        """Start a daemon thread that keeps the roster warm every `interval` seconds."""
+        if self._thread and self._thread.is_alive():
+            return
+        interval = interval or self.ttl
+        self._stop.clear()
+
+        def loop():
+            # Periodic refreshes make way for the user's requests and stop when the quota runs low
+            with request_priority(BACKGROUND):
+                while not self._stop.wait(interval):
+                    self._safe_refresh()
+
+        self._thread = threading.Thread(target=loop, name="roster-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self):
+        self._stop.set()
+
+    def _refresh_in_background(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+        # The download is billed at the caller's priority, and an empty cache
+        # doesn't download again if another thread's download is already running
+        priority, only_if_empty = current_priority(), self.players is None
+
+        def run():
+            with request_priority(priority):
+                self._safe_refresh(only_if_empty)
+
+        threading.Thread(target=run, name="roster-refresh-once", daemon=True).start()
+
+    def _safe_refresh(self, only_if_empty=False):
+        # Background refreshes should never take the app down, keep the stale copy
+        try:
+            self.refresh(only_if_empty=only_if_empty)
+        except Exception:
+            pass
+        finally:
+            self._refreshing = False
+
+    def _load_from_disk(self):
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            if self.players is None:
+                self.players = snapshot.get('players')
+                self.fetched_at = snapshot.get('fetched_at', 0.0)
+                self.etag = snapshot.get('etag')
+                self.last_modified = snapshot.get('last_modified')
+                self.version += 1
+
+    def _save_to_disk(self):
+        if self.players is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({
+                    'fetched_at': self.fetched_at,
+                    'etag': self.etag,
+                    'last_modified': self.last_modified,
+                    'players': self.players
+                }, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
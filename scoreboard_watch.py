@@ -0,0 +1,114 @@
+import os
+import time
+
+from rich.console import Group
+from rich.live import Live
+from rich.text import Text
+
+from models import parse_scoreboard
+from response_cache import make_key
+from util_methods import (
+    console,
+    RESPONSE_CACHE,
+    get_client,
+    _fetch_json,
+    scoreboard_query,
+    scoreboard_rows,
+    scoreboard_ttl,
+    build_scoreboard_table
+)
+
+# Poll intervals (seconds) depending on what the games on the board are doing
+LIVE_POLL_INTERVAL = int(os.getenv('LIVE_POLL_INTERVAL', '15'))
+SCHEDULED_POLL_INTERVAL = int(os.getenv('SCHEDULED_POLL_INTERVAL', '120'))
+
+
+def next_poll_interval(rows):
+    """
+    Poll fast while any game is live, slowly while games are still to come,
+    and return None (stop) once no game is scheduled or live any more (Final,
+    postponed or suspended).
+    """
+    status_codes = [row[4] for row in rows]
+    if not any(code in ("0", "1") for code in status_codes):
+        return None
+    if any(code == "1" for code in status_codes):
+        return LIVE_POLL_INTERVAL
+    return SCHEDULED_POLL_INTERVAL
+
+
+def diff_rows(previous, current):
+    """Return the game_ids whose row changed (or is new) since the last poll."""
+    old = {row[0]: row for row in previous}
+    return {row[0] for row in current if old.get(row[0]) != row}
+
+
+def poll_scoreboard(date):
+    """
+    Fetch a fresh scoreboard (skipping the cache read) and store it back in the
+    response cache so the regular menu benefits. Returns (rows, seconds, bytes).
+    """
+    query = scoreboard_query(date)
+    stats_before = get_client().get_stats().get("getMLBScoresOnly", {}).get('bytes', 0)
+    start = time.perf_counter()
+    data = _fetch_json("getMLBScoresOnly", query)
+    elapsed = time.perf_counter() - start
+    stats_after = get_client().get_stats().get("getMLBScoresOnly", {}).get('bytes', 0)
+
+    RESPONSE_CACHE.set(make_key("getMLBScoresOnly", query), data, scoreboard_ttl(data))
+    return scoreboard_rows(parse_scoreboard(data.get('body', {}))), elapsed, stats_after - stats_before
+
+
+def _status_bar(polls, elapsed, payload_bytes, changed, interval):
+    if interval is None:
+        next_poll = "all games Final, stopped"
+    else:
+        next_poll = f"next poll in {interval}s"
+    return Text(
+        f"polls: {polls} | last poll: {elapsed * 1000:.0f} ms, {payload_bytes / 1024:.1f} KB | "
+        f"changed: {changed} | {next_poll} | Ctrl+C to exit",
+        style="dim"
+    )
+
+
+def watch_scoreboard(date):
+    """
+    Keep the scoreboard for `date` on screen and update it as games progress.
+    Only rows that changed since the last poll are highlighted, and the table
+    is only rebuilt when something actually changed.
+    """
+    rows = []
+    table = None
+    highlighted = set()
+    polls = 0
+
+    try:
+        with Live(console=console, auto_refresh=False) as live:
+            while True:
+                try:
+                    new_rows, elapsed, payload_bytes = poll_scoreboard(date)
+                except Exception as e:
+                    live.update(Text(f"Error polling scoreboard: {str(e)}", style="red"), refresh=True)
+                    time.sleep(LIVE_POLL_INTERVAL)
+                    continue
+
+                polls += 1
+                changed = diff_rows(rows, new_rows) if rows else set()
+                interval = next_poll_interval(new_rows)
+
+                # Only rebuild the table when a row changed (or an old highlight needs
+                # clearing), the status bar updates every poll
+                if table is None or changed or highlighted:
+                    table = build_scoreboard_table(date, new_rows, highlight=changed)
+                    highlighted = changed
+                live.update(Group(table, _status_bar(polls, elapsed, payload_bytes, len(changed), interval)),
+                            refresh=True)
+                rows = new_rows
+
+                if interval is None:
+                    break
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+    return [row[0] for row in rows]
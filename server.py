@@ -0,0 +1,283 @@
+"""
+Small HTTP/JSON server over the box score, scoreboard, player and matchup
+features, so several dashboards can share one cache and one API quota.
+
+    python main.py serve --port 8765
+    GET /scoreboard/20250601
+    GET /boxscore/20250601_NYY@BOS
+    GET /players?name=Aaron%20Judge      GET /players?team=NYY
+    GET /players/592450/games?games=10&season=2025
+    GET /matchups?pitcher=Gerrit%20Cole&team=BOS
+    GET /metrics
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import requests
+
+from models import format_avg
+from player_index import PlayerNotFound
+from quota import QUOTA, QuotaExhausted
+from response_cache import SingleFlight
+from tank01_client import get_client
+from util_methods import (
+    DEFAULT_SEASON,
+    RESPONSE_CACHE,
+    console,
+    fetch_box_score,
+    fetch_scoreboard,
+    fetch_game_log,
+    fetch_batter_vs_pitcher,
+    get_player_index
+)
+
+SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+SERVER_PORT = int(os.getenv('SERVER_PORT', '8765'))
+
+# Requests per route kept for the latency percentiles and recent throughput
+METRICS_SAMPLES = 2048
+
+
+class RouteMetrics:
+    """Request counters and recent latencies for one route."""
+
+    __slots__ = ('count', 'errors', 'total_time', 'max_time', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.recent = deque(maxlen=METRICS_SAMPLES)  # (finished_at, seconds)
+
+    def record(self, elapsed, error):
+        self.count += 1
+        self.errors += int(error)
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.recent.append((time.time(), elapsed))
+
+    def as_dict(self, now):
+        latencies = sorted(elapsed for _, elapsed in self.recent)
+
+        def percentile(p):
+            # Nearest rank
+            return round(latencies[max(0, math.ceil(p * len(latencies)) - 1)] * 1000, 1) if latencies else 0.0
+
+        return {
+            'requests': self.count,
+            'errors': self.errors,
+            'requests_per_second_1m': round(sum(1 for at, _ in self.recent if at >= now - 60) / 60, 2),
+            'avg_ms': round(self.total_time / self.count * 1000, 1) if self.count else 0.0,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'max_ms': round(self.max_time * 1000, 1)
+        }
+
+
+# ----- ROUTES ------------------
+
+class BadRequest(ValueError):
+    """A missing or malformed query parameter, answered with 400."""
+
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _int_param(query, name, default):
+    try:
+        return int(_param(query, name, default))
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a number")
+
+
+def _find_player(index, text):
+    player = index.by_id(text) or index.find(text)
+    if player is None:
+        raise PlayerNotFound(text, index.suggest(text))
+    return player
+
+
+def scoreboard_route(date, query):
+    return [dict(date=date, **asdict(game)) for game in fetch_scoreboard(date)]
+
+
+def box_score_route(game_id, query):
+    box = fetch_box_score(game_id)
+    if box is None or not box.game_id:
+        raise LookupError(f"no box score found for game '{game_id}'")
+    return asdict(box)
+
+
+def players_route(query):
+    index = get_player_index()
+    name, team = _param(query, 'name'), _param(query, 'team')
+    if name:
+        players = index.find_all(name)
+        if not players:
+            raise PlayerNotFound(name, index.suggest(name))
+    elif team:
+        players = index.by_team(team)
+    else:
+        players = index.players
+    return [asdict(player) for player in players]
+
+
+def game_log_route(player_id, query):
+    games = fetch_game_log(player_id, _int_param(query, 'games', 10), _param(query, 'season', DEFAULT_SEASON))
+    return [asdict(game) for game in games]
+
+
+def matchups_route(query):
+    pitcher_name, team = _param(query, 'pitcher'), _param(query, 'team')
+    if not pitcher_name or not team:
+        raise BadRequest("both 'pitcher' and 'team' are required")
+
+    index = get_player_index()
+    pitcher = _find_player(index, pitcher_name)
+    batters = [p for p in index.by_team(team) if p.player_id != pitcher.player_id]
+    results = fetch_batter_vs_pitcher(pitcher.player_id, [b.player_id for b in batters])
+    return [
+        dict(pitcher_id=pitcher.player_id, pitcher=pitcher.name, team=team.upper(),
+             batter_id=batter.player_id, batter=batter.name,
+             **(dict(asdict(stats), avg=format_avg(stats.avg)) if stats is not None else {}))
+        for batter, stats in zip(batters, results)
+    ]
+
+
+def route(path):
+    """Match a URL path to (route name, handler taking the query dict)."""
+    parts = [unquote(part) for part in path.strip('/').split('/') if part]
+    if len(parts) == 2 and parts[0] == 'scoreboard':
+        return 'scoreboard', lambda query: scoreboard_route(parts[1], query)
+    if len(parts) == 2 and parts[0] == 'boxscore':
+        return 'boxscore', lambda query: box_score_route(parts[1], query)
+    if parts == ['players']:
+        return 'players', players_route
+    if len(parts) == 3 and parts[0] == 'players' and parts[2] == 'games':
+        return 'gamelog', lambda query: game_log_route(parts[1], query)
+    if parts == ['matchups']:
+        return 'matchups', matchups_route
+    return None, None
+
+
+# ----- SERVER ------------------
+
+class StatServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the shared metrics and request coalescing."""
+
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, StatRequestHandler)
+        self.started = time.time()
+        self.flights = SingleFlight()
+        self.metrics = {}
+        self.metrics_lock = threading.Lock()
+
+    def record(self, name, elapsed, error):
+        with self.metrics_lock:
+            if name not in self.metrics:
+                self.metrics[name] = RouteMetrics()
+            self.metrics[name].record(elapsed, error)
+
+    def metrics_snapshot(self):
+        now = time.time()
+        with self.metrics_lock:
+            routes = {name: metrics.as_dict(now) for name, metrics in self.metrics.items()}
+        return {
+            'uptime_seconds': round(now - self.started, 1),
+            'routes': routes,
+            'coalesced_requests': self.flights.coalesced,
+            'cache': {
+                'hits': RESPONSE_CACHE.hits,
+                'misses': RESPONSE_CACHE.misses,
+                'stale_hits': RESPONSE_CACHE.stale_hits,
+                'coalesced_fetches': RESPONSE_CACHE.coalesced
+            },
+            'upstream': get_client().get_stats(),
+            'quota': QUOTA.as_dict()
+        }
+
+
+class StatRequestHandler(BaseHTTPRequestHandler):
+    server_version = "MLBStatFinder"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            return self._send(200, {'status': 'ok'})
+        if url.path == '/metrics':
+            return self._send(200, self.server.metrics_snapshot())
+
+        name, handler = route(url.path)
+        if handler is None:
+            return self._send(404, {'error': f"unknown path '{url.path}'"})
+
+        start = time.perf_counter()
+        query = parse_qs(url.query)
+        # Identical requests arriving together are answered by one run (and one encode)
+        key = (url.path, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        headers = {}
+        try:
+            status, body = 200, self.server.flights.do(key, lambda: _encode(handler(query)))
+        except PlayerNotFound as e:
+            status, body = 404, _encode({'error': str(e), 'suggestions': [asdict(p) for p in e.suggestions]})
+        except LookupError as e:
+            status, body = 404, _encode({'error': str(e)})
+        except BadRequest as e:
+            status, body = 400, _encode({'error': str(e)})
+        except QuotaExhausted as e:
+            # Nothing cached to fall back on, try again once the quota resets
+            status, body = 429, _encode({'error': str(e)})
+            headers['Retry-After'] = str(int(QUOTA.seconds_left()))
+        except (requests.RequestException, ValueError) as e:
+            # A failed call or an answer that isn't the JSON we expect is upstream's fault, not the client's
+            status, body = 502, _encode({'error': f"upstream request failed: {e}"})
+        except Exception as e:
+            status, body = 500, _encode({'error': str(e)})
+
+        self._send_bytes(status, body, headers)
+        self.server.record(name, time.perf_counter() - start, error=status >= 500)
+
+    def _send(self, status, data):
+        self._send_bytes(status, _encode(data))
+
+    def _send_bytes(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Metrics cover request logging, keep the terminal quiet
+        pass
+
+
+def _encode(data):
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def serve(host=SERVER_HOST, port=SERVER_PORT):
+    """Run the server until interrupted."""
+    server = StatServer((host, port))
+    console.print(f"[green]Serving MLB stats on http://{host}:{server.server_port}[/green] (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
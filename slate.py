@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.table import Table
+
+from models import format_avg
+from profiler import PROFILER
+from util_methods import (
+    console,
+    color_team,
+    MATCHUP_CONCURRENCY,
+    fetch_box_score,
+    fetch_scoreboard,
+    fetch_matchup_pairs,
+    get_player_index
+)
+
+# Matchups with fewer at bats than this are listed after the rest, small samples rank badly
+SLATE_MIN_AB = int(os.getenv('SLATE_MIN_AB', '5'))
+
+
+def _lineup_or_roster(index, lineup, team, pitcher_id):
+    """Starting lineup if it's posted, otherwise every non-pitcher on the team's roster."""
+    if lineup:
+        return [batter_id for batter_id in lineup if batter_id != pitcher_id]
+    return [
+        player.player_id for player in index.by_team(team)
+        if player.player_id != pitcher_id and player.position not in ('P', 'SP', 'RP')
+    ]
+
+
+def build_slate(date):
+    """
+    Work out who is pitching to whom on `date`. Returns a list of
+    (game_id, pitcher_id, pitching_team, batting_team, batter_ids) with one entry
+    per side of every game whose starter is known.
+    """
+    games = fetch_scoreboard(date)
+    index = get_player_index()
+
+    # Box scores carry the starting lineups (and starters once the game is on)
+    with ThreadPoolExecutor(max_workers=max(1, min(MATCHUP_CONCURRENCY, len(games)))) as executor:
+        boxes = list(executor.map(lambda game: _safe_box_score(game.game_id), games))
+
+    sides = []
+    for game, box in zip(games, boxes):
+        away_probable = (box.away_probable if box else '') or game.away_probable
+        home_probable = (box.home_probable if box else '') or game.home_probable
+        away_lineup = box.away_lineup if box else ()
+        home_lineup = box.home_lineup if box else ()
+
+        # The home starter faces the away lineup and the other way round
+        if home_probable:
+            sides.append((game.game_id, home_probable, game.home, game.away,
+                          _lineup_or_roster(index, away_lineup, game.away, home_probable)))
+        if away_probable:
+            sides.append((game.game_id, away_probable, game.away, game.home,
+                          _lineup_or_roster(index, home_lineup, game.home, away_probable)))
+    return sides
+
+
+def _safe_box_score(game_id):
+    # Box scores for games that haven't started can be empty, that's fine here
+    try:
+        return fetch_box_score(game_id)
+    except Exception:
+        return None
+
+
+def slate_matchups(date):
+    """
+    Every batter vs probable starter matchup on `date`, fetched in one concurrent,
+    de-duplicated batch. Returns a list of dict rows with a BattingLine under 'stats'.
+    """
+    sides = build_slate(date)
+    index = get_player_index()
+
+    pairs = [(pitcher_id, batter_id) for _, pitcher_id, _, _, batters in sides for batter_id in batters]
+    results = fetch_matchup_pairs(pairs)
+
+    rows = []
+    for game_id, pitcher_id, pitching_team, batting_team, batters in sides:
+        pitcher = index.by_id(pitcher_id)
+        for batter_id in batters:
+            stats = results.get((pitcher_id, batter_id))
+            if stats is None:
+                continue
+            batter = index.by_id(batter_id)
+            rows.append({
+                'game_id': game_id,
+                'pitcher_id': pitcher_id,
+                'pitcher': pitcher.name if pitcher else pitcher_id,
+                'pitching_team': pitching_team,
+                'batter_id': batter_id,
+                'batter': batter.name if batter else batter_id,
+                'batting_team': batting_team,
+                'stats': stats
+            })
+    return rows
+
+
+def rank_matchups(rows, min_ab=None):
+    """Best matchups for the batter first: by OPS among those with enough at bats, then the rest."""
+    min_ab = SLATE_MIN_AB if min_ab is None else min_ab
+    return sorted(rows, key=lambda row: (row['stats'].ab < min_ab, -row['stats'].ops, -row['stats'].ab))
+
+
+def get_slate_report(date, top=25, min_ab=None):
+    """Print the top batter vs starter matchups across every game on `date`."""
+    try:
+        rows = rank_matchups(slate_matchups(date), min_ab)
+        if not rows:
+            console.print("[red]No probable starters or matchups found for this date[/red]")
+            return None
+
+        table = Table(title=f"Top Matchups for {date}")
+        table.add_column("#", style="bold cyan", justify="center")
+        table.add_column("Batter", style="cyan")
+        table.add_column("Team", justify="center")
+        table.add_column("Pitcher", style="magenta")
+        table.add_column("AB", justify="center")
+        table.add_column("H", justify="center")
+        table.add_column("HR", justify="center", style="yellow")
+        table.add_column("BB", justify="center")
+        table.add_column("K", justify="center")
+        table.add_column("AVG", justify="center", style="green")
+        table.add_column("OPS", justify="center", style="bold green")
+
+        for idx, row in enumerate(rows[:top], 1):
+            stats = row['stats']
+            table.add_row(
+                str(idx),
+                row['batter'],
+                color_team(row['batting_team']),
+                f"{row['pitcher']} ({row['pitching_team']})",
+                str(stats.ab),
+                str(stats.h),
+                str(stats.hr),
+                str(stats.bb),
+                str(stats.so),
+                format_avg(stats.avg),
+                format_avg(stats.ops)
+            )
+
+        with PROFILER.span("render.slate", rows=min(top, len(rows))):
+            console.print(table)
+        return rows
+
+    except Exception as e:
+        console.print(f"[red]Error building slate report: {str(e)}[/red]")
+        return None
@@ -0,0 +1,279 @@
+"""
+Snapshot archives: the raw Tank01 payloads behind the menu and headless
+commands saved to one gzipped, versioned JSON Lines file, and an offline mode
+that answers every API call from such a file instead of the network.
+
+    python main.py snapshot export week.jsonl.gz --start 20250601 --end 20250607 --player "Aaron Judge"
+    python main.py snapshot info week.jsonl.gz
+    python main.py --offline week.jsonl.gz                  # the menu, nothing goes over the network
+    python main.py --offline week.jsonl.gz slate 20250603  # any headless command
+    python main.py --record-snapshot session.jsonl.gz      # save whatever this session fetches
+
+The first line is a header ({"format": ..., "version": ..., "entries": ...}),
+every other line is {"key": <cache key>, "payload": <API response>}.
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from game_log import season_query, season_ttl
+from ingest import _days
+from models import parse_scoreboard
+from response_cache import make_key
+from util_methods import (
+    DEFAULT_SEASON,
+    MATCHUP_CONCURRENCY,
+    RESPONSE_CACHE,
+    ROSTER_CACHE,
+    WAREHOUSE,
+    _fetch_json,
+    box_score_query,
+    box_score_ttl,
+    get_client,
+    get_player_index,
+    scoreboard_query,
+    scoreboard_ttl
+)
+
+SNAPSHOT_FORMAT = 'mlbstatfinder-snapshot'
+SNAPSHOT_VERSION = 1
+
+# Run offline from this snapshot without passing --offline every time
+SNAPSHOT_PATH = os.getenv('MLB_SNAPSHOT', '')
+
+# Scoreboard fields a box score body already has, used to rebuild scoreboards of ingested dates
+_SCOREBOARD_FIELDS = ('gameID', 'away', 'home', 'gameStatusCode', 'lineScore', 'probableStartingPitchers')
+
+_KEY_PREFIX = b'{"key":'
+_PAYLOAD_SEPARATOR = b',"payload":'
+
+
+def _encode(data):
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+class Snapshot:
+    """Raw JSON payloads keyed like the response cache (endpoint?sorted query)."""
+
+    def __init__(self, entries=None, header=None):
+        self.entries = entries if entries is not None else {}  # key -> raw JSON bytes
+        self.header = header or {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, endpoint, params, payload):
+        """Store one API answer. Signature matches the client/cache recorder hooks."""
+        if payload is None:
+            return
+        body = _encode(payload)
+        with self._lock:
+            self.entries[make_key(endpoint, params)] = body
+
+    def endpoints(self):
+        return dict(Counter(key.split('?', 1)[0] for key in self.entries))
+
+    def save(self, path):
+        """Write the archive (atomically). Returns the compressed size in bytes."""
+        with self._lock:
+            entries = dict(self.entries)
+        header = {
+            'format': SNAPSHOT_FORMAT,
+            'version': SNAPSHOT_VERSION,
+            'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'entries': len(entries),
+            'endpoints': dict(Counter(key.split('?', 1)[0] for key in entries))
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            f.write(_encode(header) + b'\n')
+            for key in sorted(entries):
+                # Payloads are written as they are, load() slices them back out without decoding
+                f.write(_KEY_PREFIX + _encode(key) + _PAYLOAD_SEPARATOR + entries[key] + b'}\n')
+        os.replace(tmp_path, path)
+        self.header = header
+        return os.path.getsize(path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an archive into memory. Payloads stay raw bytes (they are only
+        decoded when something asks for them), so loading is mostly gunzip.
+        """
+        entries = {}
+        with gzip.open(path, 'rb') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get('format') != SNAPSHOT_FORMAT:
+                raise ValueError(f"{path} is not an MLBStatFinder snapshot")
+            if header.get('version', 0) > SNAPSHOT_VERSION:
+                raise ValueError(f"{path} is snapshot version {header['version']}, "
+                                 f"this version only reads up to {SNAPSHOT_VERSION}")
+
+            for line in f:
+                line = line.rstrip(b'\r\n')
+                if not line:
+                    continue
+                # A quote inside the JSON key is always escaped, so the first separator is the real one
+                split = line.find(_PAYLOAD_SEPARATOR)
+                if line.startswith(_KEY_PREFIX) and split > 0 and line.endswith(b'}'):
+                    entries[json.loads(line[len(_KEY_PREFIX):split])] = line[split + len(_PAYLOAD_SEPARATOR):-1]
+                else:
+                    entry = json.loads(line)
+                    entries[entry['key']] = _encode(entry['payload'])
+        return cls(entries, header)
+
+
+# ----- EXPORT ------------------
+
+def _add_date(snapshot, date, executor):
+    """A day's scoreboard and the box scores of its live and Final games."""
+    games = WAREHOUSE.scoreboard(date)
+    if games is None:
+        payload = RESPONSE_CACHE.get_json(_fetch_json, "getMLBScoresOnly", scoreboard_query(date), scoreboard_ttl)
+        snapshot.add("getMLBScoresOnly", scoreboard_query(date), payload)
+        games = [game for game in parse_scoreboard(payload.get('body', {})) if game.is_live or game.is_final]
+        from_warehouse = False
+    else:
+        from_warehouse = True
+
+    def box_score(game_id):
+        body = WAREHOUSE.box_score_body(game_id)
+        if body is not None:
+            return {"statusCode": 200, "body": body}
+        return RESPONSE_CACHE.get_json(_fetch_json, "getMLBBoxScore", box_score_query(game_id), box_score_ttl)
+
+    game_ids = [game.game_id for game in games]
+    payloads = list(executor.map(box_score, game_ids))
+    for game_id, payload in zip(game_ids, payloads):
+        snapshot.add("getMLBBoxScore", box_score_query(game_id), payload)
+
+    # The warehouse doesn't keep raw scoreboards, but every box score carries its game's scoreboard entry
+    if from_warehouse:
+        scoreboard = {}
+        for game_id, payload in zip(game_ids, payloads):
+            body = payload.get('body') or {}
+            scoreboard[game_id] = {field: body[field] for field in _SCOREBOARD_FIELDS if field in body}
+        snapshot.add("getMLBScoresOnly", scoreboard_query(date), {"statusCode": 200, "body": scoreboard})
+    return len(game_ids)
+
+
+def add_roster(snapshot):
+    players = ROSTER_CACHE.get()
+    if players is not None:
+        snapshot.add("getMLBPlayerList", {}, {"statusCode": 200, "body": players})
+    return len(players or ())
+
+
+def export_snapshot(path, start_date=None, end_date=None, players=(), seasons=None, max_workers=None):
+    """
+    Save the roster, every scoreboard and box score between start_date and
+    end_date, and full season game logs for `players` (names or IDs) to an
+    archive at `path`. Ingested dates and cached responses cost no API calls.
+    Returns a summary dict.
+    """
+    snapshot = Snapshot()
+    summary = {'path': path, 'roster': add_roster(snapshot), 'dates': 0, 'box_scores': 0, 'game_logs': 0}
+
+    if start_date:
+        with ThreadPoolExecutor(max_workers=max_workers or MATCHUP_CONCURRENCY) as executor:
+            for date in _days(start_date, end_date or start_date):
+                summary['box_scores'] += _add_date(snapshot, date, executor)
+                summary['dates'] += 1
+
+    if players:
+        index = get_player_index()
+        for name in players:
+            player = index.by_id(name) or index.find(name)
+            if player is None:
+                raise LookupError(f"player '{name}' not found")
+            for season in seasons or [DEFAULT_SEASON]:
+                querystring = season_query(player.player_id, season)
+                payload = RESPONSE_CACHE.get_json(_fetch_json, "getMLBGamesForPlayer", querystring,
+                                                  lambda payload: season_ttl(season) if payload.get('body') else 0)
+                snapshot.add("getMLBGamesForPlayer", querystring, payload)
+                summary['game_logs'] += 1
+
+    summary['entries'] = len(snapshot)
+    summary['bytes'] = snapshot.save(path)
+    return summary
+
+
+def snapshot_info(path):
+    """Header of an archive plus what's actually in it."""
+    snapshot = Snapshot.load(path)
+    return dict(snapshot.header, path=path, bytes=os.path.getsize(path), endpoints=snapshot.endpoints())
+
+
+# ----- RECORD / OFFLINE ------------------
+
+def start_recording():
+    """
+    Capture every API answer from here on (network or cache) into a Snapshot,
+    which the caller saves with snapshot.save(path).
+    """
+    snapshot = Snapshot()
+    RESPONSE_CACHE.recorder = snapshot.add
+    get_client().recorder = snapshot.add
+    return snapshot
+
+
+def save_recording(snapshot, path):
+    """Save a recording, with the roster if this session loaded it."""
+    if ROSTER_CACHE.players is not None:
+        add_roster(snapshot)
+    return snapshot.save(path)
+
+
+def go_offline(path):
+    """
+    Answer every Tank01 call from the archive at `path`. A call it has nothing
+    for raises replay.NotRecorded (a requests HTTPError), so it fails like a
+    request would instead of coming back empty.
+    """
+    import replay
+
+    snapshot = Snapshot.load(path)
+    client = get_client()
+    replay.install(client, replay.ReplayAdapter(snapshot.entries, strict=True,
+                                                source=f"the snapshot {os.path.basename(path)}"))
+    # Nothing to be polite to, answer at disk speed
+    client.limiter.rate = client.limiter.default_rate = 1000.0
+    client.limiter.capacity = client.limiter.tokens = 1000.0
+    client.max_retries = 0
+    client.quota = None
+    return snapshot
+
+
+def parse_snapshot_args(argv):
+    """
+    Pull --offline FILE and --record-snapshot FILE out of an argument list.
+    Returns (remaining args, offline path, record path); the offline path
+    defaults to MLB_SNAPSHOT.
+    """
+    remaining, offline_path, record_path = [], SNAPSHOT_PATH or None, None
+    args = iter(argv)
+    for arg in args:
+        if arg == '--offline':
+            offline_path = next(args, None)
+        elif arg.startswith('--offline='):
+            offline_path = arg.split('=', 1)[1]
+        elif arg == '--record-snapshot':
+            record_path = next(args, None)
+        elif arg.startswith('--record-snapshot='):
+            record_path = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    return remaining, offline_path, record_path
@@ -0,0 +1,289 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from profiler import PROFILER
+from quota import QUOTA, INTERACTIVE, current_priority
+from response_cache import SingleFlight, make_key
+
+API_HOST = "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
+BASE_URL = f"https://{API_HOST}"
+
+# The .env with RAPIDAPI_KEY sits next to this file, wherever the app is started from
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+
+# Status codes worth retrying: rate limited or a hiccup on RapidAPI's side
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Simple token bucket limiter. The refill rate starts at `rate` requests per
+    second and is tightened from the short window x-ratelimit headers and the
+    Retry-After of a 429.
+    Callers waiting for a token are served by priority, then in arrival order.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.default_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._waiting = []  # heap of (priority, arrival) tickets
+        self._arrivals = itertools.count()
+
+    def acquire(self, priority=INTERACTIVE):
+        """Block until a token is available and every caller ahead in line has had theirs."""
+        with self._ready:
+            ticket = (priority, next(self._arrivals))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self._waiting[0] != ticket:
+                        self._ready.wait()
+                    elif self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    else:
+                        self._ready.wait((1 - self.tokens) / self.rate)
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._ready.notify_all()
+
+    def update_from_headers(self, remaining, reset_seconds):
+        """
+        Spread whatever quota is left evenly over the time until it resets, but
+        never go faster than the configured default rate.
+        """
+        if remaining is None or reset_seconds is None:
+            return
+        with self._lock:
+            if remaining <= 0:
+                self.rate = 1.0 / max(reset_seconds, 1.0)
+                self.tokens = 0
+            else:
+                self.rate = min(self.default_rate, max(remaining / max(reset_seconds, 1.0), 0.01))
+
+    def pause(self, seconds):
+        """Hand out no tokens for `seconds`, to anyone (after a 429)."""
+        with self._ready:
+            self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+class EndpointStats:
+    """Latency and quota counters for one API endpoint."""
+
+    __slots__ = ('calls', 'errors', 'retries', 'total_time', 'max_time', 'bytes', 'quota_remaining')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.bytes = 0
+        self.quota_remaining = None
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': round(self.total_time / self.calls * 1000, 1) if self.calls else 0.0,
+            'max_ms': round(self.max_time * 1000, 1),
+            'bytes': self.bytes,
+            'quota_remaining': self.quota_remaining
+        }
+
+
+def _header_int(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                pass
+    return None
+
+
+class Tank01Client:
+    """
+    Shared client for the Tank01 MLB API: one pooled keep-alive session, gzip,
+    retries with exponential backoff + jitter, and a quota aware rate limiter.
+    """
+
+    def __init__(self, api_key=None, timeout=10.0, max_retries=4, backoff=0.5,
+                 rate_per_second=5.0, pool_size=16, quota=None):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limiter = TokenBucket(rate_per_second)
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+        self.recorder = None  # called as recorder(endpoint, params, payload) after each get_json
+        self.quota = quota  # QuotaLedger every sent call is counted against, None to not count
+        self._flights = SingleFlight()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "x-rapidapi-key": api_key or "",
+            "x-rapidapi-host": API_HOST,
+            "Accept-Encoding": "gzip, deflate"
+        })
+
+    def get(self, endpoint, params=None, headers=None, timeout=None, stream=False):
+        """
+        GET an endpoint (e.g. "getMLBBoxScore") and return the requests Response.
+        Retries 429/5xx and connection errors; raises after max_retries. With
+        stream=True the body is left unread for response.iter_content(). Raises
+        QuotaExhausted rather than send a call the monthly quota can't cover.
+        """
+        url = f"{BASE_URL}/{endpoint}"
+        stats = self._stats_for(endpoint)
+        attempt = 0
+
+        while True:
+            if self.quota is not None:
+                self.quota.check(endpoint)
+            queued = time.perf_counter()
+            self.limiter.acquire(current_priority())
+            start = time.perf_counter()
+            with PROFILER.span(f"api.{endpoint}", kind='http', endpoint=endpoint, attempt=attempt,
+                               queue_ms=round((start - queued) * 1000, 1)) as span:
+                response = failure = None
+                try:
+                    response = self.session.get(url, params=params, headers=headers,
+                                                timeout=timeout or self.timeout, stream=stream)
+                    span.set(**{'http.status_code': response.status_code,
+                                'headers_ms': round(response.elapsed.total_seconds() * 1000, 1)})
+                    if not stream:
+                        # .content reads the whole body, so the span covers the download too
+                        span.set(bytes=len(response.content or b''))
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    span.set(error=type(e).__name__)
+                    failure = e
+
+            if failure is not None:
+                self._record(stats, time.perf_counter() - start, error=True)
+                if attempt >= self.max_retries:
+                    raise failure
+                attempt += 1
+                stats.retries += 1
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            self._record(stats, time.perf_counter() - start, response=None if stream else response,
+                         error=response.status_code >= 400)
+            # Rate limited calls aren't billed, everything that got an answer is
+            if self.quota is not None and response.status_code != 429:
+                self.quota.spend()
+            self._update_quota(stats, response)
+
+            retry_after = _header_int(response.headers, 'Retry-After')
+            if response.status_code == 429 and retry_after is not None:
+                # Every thread backs off, not only the one that was told to
+                self.limiter.pause(retry_after)
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                response.close()
+                attempt += 1
+                stats.retries += 1
+                time.sleep(retry_after if retry_after is not None else self._backoff_delay(attempt))
+                continue
+
+            return response
+
+    def get_json(self, endpoint, params=None, timeout=None):
+        """
+        GET an endpoint and return the decoded JSON payload. Identical requests
+        already on their way share that one call.
+        """
+        return self._flights.do(make_key(endpoint, params),
+                                lambda: self._get_json(endpoint, params, timeout))
+
+    def _get_json(self, endpoint, params, timeout):
+        response = self.get(endpoint, params=params, timeout=timeout)
+        response.raise_for_status()
+        with PROFILER.span("json.decode", endpoint=endpoint, bytes=len(response.content)):
+            payload = response.json()
+        if self.recorder is not None:
+            self.recorder(endpoint, params, payload)
+        return payload
+
+    def get_stats(self):
+        """Per-endpoint counters as plain dicts."""
+        with self._stats_lock:
+            return {endpoint: stats.as_dict() for endpoint, stats in self.stats.items()}
+
+    def close(self):
+        self.session.close()
+
+    def _stats_for(self, endpoint):
+        with self._stats_lock:
+            if endpoint not in self.stats:
+                self.stats[endpoint] = EndpointStats()
+            return self.stats[endpoint]
+
+    def _record(self, stats, elapsed, response=None, error=False):
+        with self._stats_lock:
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+            if error:
+                stats.errors += 1
+            if response is not None:
+                stats.bytes += len(response.content or b'')
+
+    def _update_quota(self, stats, response):
+        # Only the short window headers pace the limiter. The x-ratelimit-requests-*
+        # trio is the plan's monthly quota, spreading that over weeks would stall
+        # every call, so it only goes to the quota ledger.
+        self.limiter.update_from_headers(_header_int(response.headers, 'x-ratelimit-remaining'),
+                                         _header_int(response.headers, 'x-ratelimit-reset'))
+        monthly_remaining = _header_int(response.headers, 'x-ratelimit-requests-remaining')
+        if monthly_remaining is not None:
+            stats.quota_remaining = monthly_remaining
+            if self.quota is not None:
+                self.quota.observe(_header_int(response.headers, 'x-ratelimit-requests-limit'), monthly_remaining,
+                                   _header_int(response.headers, 'x-ratelimit-requests-reset'))
+
+    def _backoff_delay(self, attempt):
+        # Exponential backoff with full jitter
+        return random.uniform(0, self.backoff * (2 ** (attempt - 1)))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process wide Tank01Client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            load_dotenv(ENV_FILE if os.path.exists(ENV_FILE) else None)
+            _client = Tank01Client(
+                api_key=os.getenv('RAPIDAPI_KEY'),
+                timeout=float(os.getenv('REQUEST_TIMEOUT', '10')),
+                rate_per_second=float(os.getenv('TANK01_RATE_PER_SECOND', '5')),
+                quota=QUOTA
+            )
+        return _client
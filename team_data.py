@@ -1,4 +1,7 @@
-{
+"""Team tables used for display, kept as constants so nothing is read from disk at startup."""
+
+# Rich color for each team abbreviation
+TEAM_COLORS = {
     "ARI": "#A71930",
     "ATL": "#13274F",
     "BAL": "#DF4601",
@@ -12,7 +15,7 @@
     "HOU": "#F4911E",
     "KC": "#004687",
     "LAA": "#BA0021",
-    "LAD": "#005A9C;",
+    "LAD": "#005A9C",
     "MIA": "#00A3E0",
     "MIL": "#ffc52f",
     "MIN": "#D31145",
@@ -29,4 +32,7 @@
     "TEX": "#003278",
     "TOR": "#134A8E",
     "WSH": "#14225A"
-}
\ No newline at end of file
+}
+
+# Every MLB team abbreviation the API uses
+TEAMS = tuple(TEAM_COLORS)
@@ -0,0 +1,13 @@
+"""The menu has to come up fast: its imports stay under budget and leave the HTTP stack for later."""
+from bench import DEFERRED_MODULES, STARTUP_BUDGET_MS, measure_startup
+
+
+def test_menu_imports_within_budget():
+    elapsed, _ = measure_startup(repeat=3)
+    assert elapsed <= STARTUP_BUDGET_MS, f"menu imports took {elapsed} ms, budget is {STARTUP_BUDGET_MS:g} ms"
+
+
+def test_menu_defers_http_stack():
+    _, loaded = measure_startup(repeat=1)
+    assert not loaded, f"startup imported {', '.join(loaded)}, these should load on first API call"
+    assert {'requests', 'urllib3', 'dotenv'} <= set(DEFERRED_MODULES)
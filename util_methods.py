@@ -1,15 +1,45 @@
-import requests
-import json
 import os
-import http.client
-from dotenv import load_dotenv
+import threading
+import time
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.table import Table
-from rich.prompt import Prompt
 
-# Load environment variables
-load_dotenv()
-RAPIDAPI_KEY = os.getenv('RAPIDAPI_KEY')
+from roster_cache import RosterCache
+from player_index import PlayerIndex, normalize_name
+from profiler import PROFILER
+from json_stream import iter_array
+from response_cache import ResponseCache, PINNED
+from quota import QUOTA, QuotaExhausted
+from warehouse import Warehouse
+from team_data import TEAM_COLORS
+from models import (
+    format_avg,
+    parse_box_score,
+    parse_scoreboard,
+    parse_roster,
+    parse_game_log,
+    parse_matchup
+)
+
+# How many batter-vs-pitcher requests to run at once (the client handles timeouts)
+MATCHUP_CONCURRENCY = int(os.getenv('MATCHUP_CONCURRENCY', '8'))
+
+# Seconds to cache box scores/scoreboards for games that aren't Final yet
+LIVE_CACHE_TTL = int(os.getenv('LIVE_CACHE_TTL', '15'))
+
+# Seconds to cache batter vs pitcher history, it only changes after games are played
+MATCHUP_CACHE_TTL = int(os.getenv('MATCHUP_CACHE_TTL', str(6 * 60 * 60)))
+
+# Season used for player stats when none is given
+DEFAULT_SEASON = os.getenv('MLB_SEASON', str(date.today().year))
+
+# Seconds a streaming player lookup waits on the roster download before falling back to the full list
+ROSTER_STREAM_TIMEOUT = float(os.getenv('ROSTER_STREAM_TIMEOUT', '30'))
+
+# Only these fields of each getMLBPlayerList entry are kept
+ROSTER_FIELDS = ('playerID', 'longName', 'team', 'pos')
 
 # Create console instance at module level
 console = Console()
@@ -19,202 +49,347 @@ __all__ = [
     'console',
     'get_box_score',
     'get_daily_scoreboard',
-    'get_active_players'  # Add this line
+    'get_active_players',  # Add this line
+    'ROSTER_CACHE',
+    'get_player_index',
+    'fetch_batter_vs_pitcher',
+    'fetch_matchup',
+    'fetch_matchup_pairs',
+    'RESPONSE_CACHE',
+    'fetch_box_score',
+    'fetch_scoreboard',
+    'fetch_game_log',
+    'WAREHOUSE'
 ]
 
-def load_team_colors():
+def get_client():
+    """
+    The shared Tank01Client. requests (the slowest import by far) is only
+    loaded the first time something actually calls the API, not at startup.
+    """
+    from tank01_client import get_client as shared_client
+    return shared_client()
+
+def color_team(team):
+    """Wrap a team abbreviation in its rich color markup."""
+    team_color = TEAM_COLORS.get(team, "#ffffff")
+    return f"[{team_color}]{team}[/]"
+
+# Callbacks handed each player as the roster streams in, then None once it's done
+_ROSTER_WATCHERS = []
+_ROSTER_WATCHERS_LOCK = threading.Lock()
+
+def _notify_roster_watchers(player):
+    with _ROSTER_WATCHERS_LOCK:
+        watchers = list(_ROSTER_WATCHERS)
+    for watcher in watchers:
+        watcher(player)
+
+def _fetch_player_list(etag=None, last_modified=None):
+    """
+    Download the full getMLBPlayerList roster. Sends conditional headers so an
+    unchanged roster comes back as a cheap 304 (players=None). The body is
+    decoded one player at a time as it arrives, keeping only ROSTER_FIELDS.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
     try:
-        with open('team_colors.json', 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        console.print(f"[red]Error loading team colors: {str(e)}[/red]")
-        return {}
+        response = get_client().get("getMLBPlayerList", headers=headers, stream=True)
+        with response:
+            if response.status_code == 304:
+                return None, etag, last_modified
+            response.raise_for_status()
 
-# Load team colors once when module is imported
-TEAM_COLORS = load_team_colors()
+            players = []
+            received = 0
 
-def get_box_score(game_id):
-    url = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBBoxScore"
-    
-    querystring = {
+            def chunks():
+                nonlocal received
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    received += len(chunk)
+                    yield chunk
+
+            with PROFILER.span("json.stream", endpoint="getMLBPlayerList") as span:
+                for player in iter_array(chunks(), 'body', ROSTER_FIELDS):
+                    players.append(player)
+                    _notify_roster_watchers(player)
+                span.set(bytes=received, players=len(players))
+        return players, response.headers.get('ETag'), response.headers.get('Last-Modified')
+    finally:
+        _notify_roster_watchers(None)
+
+def find_player_streaming(name):
+    """
+    Look a player up while the roster is still downloading: the answer comes
+    back as soon as their entry arrives, and the download carries on in the
+    background to fill the roster cache. Only worth it when the cache is empty.
+    Returns the slim player dict, or None if the full list didn't have them or
+    the roster is (now) cached, for the caller to look them up in the index.
+    """
+    target = normalize_name(name)
+    found = []
+    done = threading.Event()
+
+    def watch(player):
+        if player is None:
+            done.set()
+        elif not found and normalize_name(player.get('longName', '')) == target:
+            found.append(player)
+            done.set()
+
+    with _ROSTER_WATCHERS_LOCK:
+        _ROSTER_WATCHERS.append(watch)
+    try:
+        if ROSTER_CACHE.get(block=False) is not None:
+            return None  # the roster was on disk after all, use the index
+        deadline = time.monotonic() + ROSTER_STREAM_TIMEOUT
+        while not done.wait(0.5):
+            # A download that finished before this watcher was added never calls it,
+            # and a stuck one shouldn't hang the menu: either way the index has the answer
+            if ROSTER_CACHE.players is not None or time.monotonic() > deadline:
+                return None
+        return found[0] if found else None
+    finally:
+        with _ROSTER_WATCHERS_LOCK:
+            _ROSTER_WATCHERS.remove(watch)
+
+# Shared roster cache, the player list barely changes so this saves a 6-7s download
+ROSTER_CACHE = RosterCache(_fetch_player_list)
+
+_PLAYER_INDEX = None
+
+def get_player_index():
+    """
+    Return the PlayerIndex for the current roster snapshot, rebuilding it only
+    when the roster cache has picked up a new player list.
+    """
+    global _PLAYER_INDEX
+    players = ROSTER_CACHE.get() or []
+    if _PLAYER_INDEX is None or _PLAYER_INDEX.version != ROSTER_CACHE.version:
+        with PROFILER.span("index.build", players=len(players)):
+            _PLAYER_INDEX = PlayerIndex(parse_roster(players), version=ROSTER_CACHE.version)
+    return _PLAYER_INDEX
+
+def print_player_suggestions(index, name):
+    """Print ranked 'did you mean' candidates for a name that wasn't found."""
+    suggestions = index.suggest(name)
+    if suggestions:
+        console.print("[yellow]Did you mean:[/yellow]")
+        for player in suggestions:
+            console.print(f"  {player.name} {color_team(player.team or 'N/A')}")
+
+# Box scores and scoreboards keyed by endpoint + params
+RESPONSE_CACHE = ResponseCache(max_entries=2048, quota=QUOTA)
+
+# Local SQLite store of ingested Final games, checked before going to the API
+WAREHOUSE = Warehouse()
+
+def _fetch_json(endpoint, params):
+    return get_client().get_json(endpoint, params=params)
+
+def is_game_final(game_info):
+    return game_info.get('gameStatusCode') == "2" or game_info.get('gameStatus') in ("Final", "Completed")
+
+def box_score_ttl(payload):
+    """A Final box score can never change again so it's pinned, live ones expire quickly."""
+    data = payload.get('body')
+    if not isinstance(data, dict) or not data:
+        return 0
+    return PINNED if is_game_final(data) else LIVE_CACHE_TTL
+
+def is_game_settled(game_info):
+    """Final, postponed or suspended: nothing more happens in this game on its day (same rule as ingest)."""
+    code = game_info.get('gameStatusCode')
+    if code in ("0", "1"):
+        return False
+    return bool(code) or is_game_final(game_info)
+
+def scoreboard_ttl(payload):
+    """Pin a day's scoreboard once no game on it is still to be played or live."""
+    games = payload.get('body')
+    if not isinstance(games, dict) or not games:
+        return 0
+    if all(isinstance(game, dict) and is_game_settled(game) for game in games.values()):
+        return PINNED
+    return LIVE_CACHE_TTL
+
+# ----- BOX SCORE ------------------
+
+def box_score_query(game_id):
+    return {
         "gameID": game_id,
         "playerStatsFormat": "list",
         "startingLineups": "true",
         "fantasyPoints": "true"
     }
 
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
-    }
+def fetch_box_score(game_id):
+    """Fetch (or read from the warehouse/cache) and parse a box score. Returns a BoxScore or None."""
+    with PROFILER.span("warehouse.read", query="box_score"):
+        body = WAREHOUSE.box_score_body(game_id)
+    if body is None:
+        data = RESPONSE_CACHE.get_json(_fetch_json, "getMLBBoxScore", box_score_query(game_id), box_score_ttl)
+        body = data.get('body', {})
+    with PROFILER.span("parse.box_score"):
+        return parse_box_score(body, game_id)
+
+def create_team_stats_table(team_stats, team_name):
+    stats_table = Table(title=f"{team_name} Team Stats")
+    stats_table.add_column("Category", style="cyan")
+    stats_table.add_column("Value", style="white")
+
+    if team_stats is None:
+        return stats_table
+
+    batting = team_stats.batting
+    pitching = team_stats.pitching
+    rows = [
+        # Hitting
+        ("AB", batting.ab), ("H", batting.h), ("R", batting.r), ("RBI", batting.rbi),
+        ("BB", batting.bb), ("SO", batting.so), ("HR", batting.hr), ("AVG", format_avg(batting.avg)),
+        # Pitching
+        ("IP", pitching.ip), ("H", pitching.h), ("R", pitching.r), ("ER", pitching.er),
+        ("BB", pitching.bb), ("SO", pitching.so), ("HR", pitching.hr), ("Pitches", pitching.pitches),
+        # BaseRunning
+        ("SB", batting.sb), ("CS", batting.cs),
+        # Fielding
+        ("E", team_stats.errors), ("Passed Ball", team_stats.passed_balls)
+    ]
+    for stat, value in rows:
+        stats_table.add_row(stat, str(value))
 
-    response = requests.get(url, headers=headers, params=querystring)
-    data = response.json().get('body', {})
-    
+    return stats_table
+
+def render_box_score(box):
     # Game Info Table
     info_table = Table(title="Game Information", show_header=False)
     info_table.add_column("Info", style="cyan")
     info_table.add_column("Value", style="white")
-    
-    info_table.add_row("Venue", data.get('Venue', 'N/A'))
-    info_table.add_row("Weather", data.get('Weather', 'N/A'))
-    info_table.add_row("First Pitch", data.get('FirstPitch', 'N/A'))
-    info_table.add_row("Game Length", data.get('GameLength', 'N/A'))
-    info_table.add_row("Attendance", data.get('Attendance', 'N/A'))
-    
+
+    info_table.add_row("Venue", box.venue)
+    info_table.add_row("Weather", box.weather)
+    info_table.add_row("First Pitch", box.first_pitch)
+    info_table.add_row("Game Length", box.game_length)
+    info_table.add_row("Attendance", box.attendance)
+
     # Line Score Table
-    line_score = data.get('lineScore', {})
     line_table = Table(title="Line Score")
     line_table.add_column("Team", style="cyan")
-    
-    # Determine max innings from actual game data
-    away_scores = line_score.get('away', {}).get('scoresByInning', {})
-    home_scores = line_score.get('home', {}).get('scoresByInning', {})
-    max_innings = max(
-        9,  # minimum 9 innings
-        max(
-            max(map(lambda x: int(x), away_scores.keys())) if away_scores else 0,
-            max(map(lambda x: int(x), home_scores.keys())) if home_scores else 0
-        )
-    )
-    
+
+    # Determine max innings from actual game data (minimum 9 innings)
+    max_innings = max(9, len(box.away_line.innings), len(box.home_line.innings))
+
     # Add inning columns
     for i in range(1, max_innings + 1):
         line_table.add_column(str(i), justify="center", width=3)
     line_table.add_column("R", justify="center", style="green")
     line_table.add_column("H", justify="center")
     line_table.add_column("E", justify="center", style="red")
-    
-    # Add away team line score
-    away_line = [data.get('away', 'Away')]
-    for i in range(1, max_innings + 1):
-        away_line.append(away_scores.get(str(i), ' '))
-    away_stats = line_score.get('away', {})
-    away_line.extend([
-        away_stats.get('R', '0'),
-        away_stats.get('H', '0'),
-        away_stats.get('E', '0')
-    ])
-    line_table.add_row(*[str(x) for x in away_line])
-    
-    # Add home team line score
-    home_line = [data.get('home', 'Home')]
-    for i in range(1, max_innings + 1):
-        home_line.append(home_scores.get(str(i), ' '))
-    home_stats = line_score.get('home', {})
-    home_line.extend([
-        home_stats.get('R', '0'),
-        home_stats.get('H', '0'),
-        home_stats.get('E', '0')
-    ])
-    line_table.add_row(*[str(x) for x in home_line])
+
+    # Add away and home team line scores
+    for line in (box.away_line, box.home_line):
+        innings = list(line.innings) + [' '] * (max_innings - len(line.innings))
+        line_table.add_row(line.team, *innings, str(line.runs), str(line.hits), str(line.errors))
 
     # Team Stats Tables
-    def create_team_stats_table(team_stats, team_name):
-        stats_table = Table(title=f"{team_name} Team Stats")
-        stats_table.add_column("Category", style="cyan")
-        stats_table.add_column("Value", style="white")
-        
-        categories = {
-            "Hitting": ["AB", "H", "R", "RBI", "BB", "SO", "HR", "AVG"],
-            "Pitching": ["IP", "H", "R", "ER", "BB", "SO", "HR", "Pitches"],
-            "BaseRunning": ["SB", "CS"],
-            "Fielding": ["E", "Passed Ball"]
-        }
-        
-        for category, stats in categories.items():
-            if category in team_stats:
-                for stat in stats:
-                    value = team_stats[category].get(stat, '0')
-                    stats_table.add_row(stat, str(value))
-        
-        return stats_table
-    
-    away_stats = data.get('teamStats', {}).get('away', {})
-    home_stats = data.get('teamStats', {}).get('home', {})
-    
-    away_stats_table = create_team_stats_table(away_stats, data.get('away', 'Away'))
-    home_stats_table = create_team_stats_table(home_stats, data.get('home', 'Home'))
-    
+    away_stats_table = create_team_stats_table(box.away_stats, box.away)
+    home_stats_table = create_team_stats_table(box.home_stats, box.home)
+
     # Print all tables
-    console.print(info_table)
-    console.print("\n")
-    console.print(line_table)
-    console.print("\n")
-    console.print(away_stats_table)
-    console.print("\n")
-    console.print(home_stats_table)
-def get_daily_scoreboard(date):
-    url = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBScoresOnly"
-    
-    querystring = {
+    with PROFILER.span("render.box_score"):
+        console.print(info_table)
+        console.print("\n")
+        console.print(line_table)
+        console.print("\n")
+        console.print(away_stats_table)
+        console.print("\n")
+        console.print(home_stats_table)
+
+def get_box_score(game_id):
+    try:
+        box = fetch_box_score(game_id)
+    except QuotaExhausted as e:
+        # Nothing cached for this game, not even expired
+        console.print(f"[yellow]{str(e)}[/yellow]")
+        return None
+    except Exception as e:
+        console.print(f"[red]Error fetching box score: {str(e)}[/red]")
+        return None
+    if box is None:
+        console.print(f"[red]No box score found for game '{game_id}'[/red]")
+        return None
+    render_box_score(box)
+    return box
+
+# ----- DAILY SCOREBOARD ------------------
+
+def scoreboard_query(date):
+    return {
         "gameDate": date,
         "topPerformers": "true"
     }
 
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
-    }
+def fetch_scoreboard(date):
+    """Fetch (or read from the warehouse/cache) and parse a day's scoreboard into ScoreboardGames."""
+    with PROFILER.span("warehouse.read", query="scoreboard"):
+        games = WAREHOUSE.scoreboard(date)
+    if games:
+        return games
+    data = RESPONSE_CACHE.get_json(_fetch_json, "getMLBScoresOnly", scoreboard_query(date), scoreboard_ttl)
+    with PROFILER.span("parse.scoreboard"):
+        return parse_scoreboard(data.get('body', {}))
+
+def scoreboard_rows(games):
+    """
+    Turn ScoreboardGames into (game_id, matchup, score, status, status_code)
+    display rows, in the order the API lists the games.
+    """
+    rows = []
+    for game in games:
+        game_status = "Hasn't started"
+        # Format the matchup and score with colored team names
+        matchup = f"{color_team(game.away)} @ {color_team(game.home)}"
+        score = f"{game.away_runs}-{game.home_runs}"
+
+        # Add status details for live games
+        if game.is_live:
+            game_status = f"{game.current_inning} ({game.current_outs} outs)"
+        elif game.is_final:
+            game_status = "Final"
 
-    response = requests.get(url, headers=headers, params=querystring)
-    data = response.json()
-    
-    # Create a table to display scores
+        rows.append((game.game_id, matchup, score, game_status, game.status_code))
+    return rows
+
+def build_scoreboard_table(date, rows, highlight=()):
+    """Build the scoreboard Table, rows whose game_id is in `highlight` are shown in bold."""
     table = Table(title=f"MLB Scores for {date}")
     table.add_column("#", style="bold cyan", justify="center")
     table.add_column("Game", style="cyan", justify="left")
     table.add_column("Score", style="green", justify="center")
     table.add_column("Status", style="yellow", justify="right")
-    
-    # Store game_ids for return
-    game_list = []
-    
+
+    for idx, (game_id, matchup, score, game_status, _) in enumerate(rows, 1):
+        table.add_row(str(idx), matchup, score, game_status,
+                      style="bold reverse" if game_id in highlight else None)
+    return table
+
+def get_daily_scoreboard(date):
     try:
-        games = data.get('body', {})
-        if isinstance(games, dict):
-            for idx, (game_id, game_info) in enumerate(games.items(), 1):
-                away_team = game_info.get('away', 'N/A')
-                home_team = game_info.get('home', 'N/A')
-                game_status = "Hasn't started"
-                # Color the team abbreviations
-                away_color = TEAM_COLORS.get(away_team, "#ffffff")
-                home_color = TEAM_COLORS.get(home_team, "#ffffff")
-                away_colored = f"[{away_color}]{away_team}[/]"
-                home_colored = f"[{home_color}]{home_team}[/]"
-                
-                # Get line scores
-                line_score = game_info.get('lineScore', {})
-                if line_score and isinstance(line_score, dict):
-                    away_data = line_score.get('away', {})
-                    home_data = line_score.get('home', {})
-                    away_score = away_data.get('R') if away_data else '0'
-                    home_score = home_data.get('R') if home_data else '0'
-                else:
-                    away_score = '0'
-                    home_score = '0'
-                
-                # Format the matchup and score with colored team names
-                matchup = f"{away_colored} @ {home_colored}"
-                score = f"{away_score}-{home_score}"
-                
-                # Add status details for live games
-                if game_info.get('gameStatusCode') == "1":
-                    current_inning = game_info.get('currentInning', '')
-                    current_outs = game_info.get('currentOuts', '')
-                    game_status = f"{current_inning} ({current_outs} outs)"
-                elif game_info.get('gameStatusCode') == "2":
-                    game_status = "Final"
-                
-                table.add_row(str(idx), matchup, score, game_status)
-                game_list.append(game_id)
-                
+        rows = scoreboard_rows(fetch_scoreboard(date))
     except Exception as e:
         console.print(f"[red]Error processing game data: {str(e)}[/red]")
         return None
-    
-    console.print(table)
-    return game_list
+
+    with PROFILER.span("render.scoreboard", rows=len(rows)):
+        console.print(build_scoreboard_table(date, rows))
+    # Return the game_ids so a game can be picked by number
+    return [row[0] for row in rows]
+
+# ----- PLAYERS ------------------
 
 def get_active_players(player_name=None):
     """
@@ -222,92 +397,117 @@ def get_active_players(player_name=None):
     If player_name is provided, returns that player's ID.
     Otherwise returns a dictionary mapping player names to their info.
     """
-    url = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBPlayerList"
-    
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
-    }
-
     try:
-        response = requests.get(url, headers=headers)
-        data = response.json()
-        
+        if player_name and ROSTER_CACHE.players is None:
+            # Cold start: answer as soon as the player streams past instead of waiting for the whole list
+            player = find_player_streaming(player_name)
+            if player:
+                return str(player.get('playerID', ''))
+
+        index = get_player_index()
+
         if player_name:  # If searching for a specific player
-            if 'body' in data:
-                players = data['body']
-                for player_info in players:
-                    if player_info.get('longName', '').lower() == player_name.lower():
-                        return player_info.get('playerID')
+            player = index.find(player_name)
+            if player:
+                return player.player_id
             console.print(f"[red]Player '{player_name}' not found[/red]")
+            print_player_suggestions(index, player_name)
             return None
-        
+
         # Original functionality for listing all players
         table = Table(title="Active MLB Players")
         table.add_column("Player Name", style="cyan")
         table.add_column("Team", style="green")
         table.add_column("Player ID", style="yellow")
-        
+
         players_dict = {}
-        
-        if 'body' in data:
-            players = data['body']
-            for player_info in players:
-                name = player_info.get('longName', 'N/A')
-                team = player_info.get('team', 'N/A')
-                player_id = player_info.get('playerID', 'N/A')
-                
-                players_dict[name] = {
-                    'team': team,
-                    'playerID': player_id
-                }
-                
-                team_color = TEAM_COLORS.get(team, "#ffffff")
-                team_colored = f"[{team_color}]{team}[/]"
-                table.add_row(name, team_colored, player_id)
-                
-        console.print(table)
+
+        for player in index.players:
+            players_dict[player.name] = {
+                'team': player.team,
+                'playerID': player.player_id
+            }
+            table.add_row(player.name, color_team(player.team), player.player_id)
+
+        with PROFILER.span("render.players", rows=len(players_dict)):
+            console.print(table)
         return players_dict
-    
+
     except Exception as e:
         console.print(f"[red]Error fetching player list: {str(e)}[/red]")
         return None
 
+# ----- PITCHER MATCHUPS ------------------
+
+def matchup_query(pitcher_id, batter_id):
+    return {"playerID": pitcher_id, "playerRole": "", "opponent": batter_id}
+
+def fetch_matchup(pitcher_id, batter_id, timeout=None):
+    """
+    One batter's history against one pitcher (cached for MATCHUP_CACHE_TTL) as
+    a BattingLine, empty if they've never faced each other. None if the request
+    failed.
+    """
+    def fetch(endpoint, params):
+        return get_client().get_json(endpoint, params=params, timeout=timeout)
+
+    try:
+        data = RESPONSE_CACHE.get_json(fetch, "getMLBBatterVsPitcher", matchup_query(pitcher_id, batter_id),
+                                       lambda payload: MATCHUP_CACHE_TTL if 'body' in payload else 0)
+        with PROFILER.span("parse.matchup"):
+            return parse_matchup(data.get('body'))
+    except (ValueError, QuotaExhausted):
+        return None
+    except Exception as e:
+        from requests import RequestException  # already loaded along with the client
+        if isinstance(e, RequestException):
+            return None
+        raise
+
+def fetch_matchup_pairs(pairs, max_workers=None, timeout=None):
+    """
+    Fetch getMLBBatterVsPitcher for many (pitcher_id, batter_id) pairs at once.
+    Duplicate pairs are only requested once and answers are cached for
+    MATCHUP_CACHE_TTL. Returns {pair: BattingLine}, None for a failed request.
+    """
+    max_workers = max_workers or MATCHUP_CONCURRENCY
+    unique_pairs = list(dict.fromkeys(pairs))
+
+    if not unique_pairs:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_pairs))) as executor:
+        results = executor.map(lambda pair: fetch_matchup(*pair, timeout=timeout), unique_pairs)
+        return dict(zip(unique_pairs, results))
+
+def fetch_batter_vs_pitcher(pitcher_id, batter_ids, max_workers=None, timeout=None):
+    """
+    Fetch getMLBBatterVsPitcher for every batter concurrently and parse each into
+    a BattingLine. Results come back in the same order as batter_ids; a failed
+    request gives None for that batter.
+    """
+    pairs = [(pitcher_id, batter_id) for batter_id in batter_ids]
+    results = fetch_matchup_pairs(pairs, max_workers, timeout)
+    return [results.get(pair) for pair in pairs]
+
 def get_pitcher_matchups(pitcher_name, opposing_team):
     """
     Get pitcher vs batter stats for all active players on the opposing team.
     """
-    # First get all active players to find pitcher's ID
-    url_players = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBPlayerList"
-    
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
-    }
-
     try:
-        # Get all players
-        response = requests.get(url_players, headers=headers)
-        data = response.json()
-        
-        pitcher_id = None
-        opposing_players = []
-
-        if 'body' in data:
-            players = data['body']
-            # Find pitcher ID and opposing team players
-            for player in players:
-                if player.get('longName', '').lower() == pitcher_name.lower():
-                    pitcher_id = player.get('playerID')
-                elif player.get('team') == opposing_team:
-                    opposing_players.append({
-                        'name': player.get('longName'),
-                        'playerID': player.get('playerID')
-                    })
-
-        if not pitcher_id:
+        # Look up the pitcher and opposing team in the roster index
+        index = get_player_index()
+
+        pitcher = index.find(pitcher_name)
+        if not pitcher:
             console.print(f"[red]Pitcher '{pitcher_name}' not found[/red]")
+            print_player_suggestions(index, pitcher_name)
             return
+        pitcher_id = pitcher.player_id
+
+        opposing_players = [
+            player for player in index.by_team(opposing_team)
+            if player.player_id != pitcher_id
+        ]
 
         # Create matchup stats table
         matchup_table = Table(title=f"Pitcher Matchups: {pitcher_name} vs {opposing_team}")
@@ -322,65 +522,65 @@ def get_pitcher_matchups(pitcher_name, opposing_team):
         matchup_table.add_column("K", justify="center")
         matchup_table.add_column("AVG", justify="center", style="green")
 
-        # Get matchup stats for each opposing player
-        url_matchup = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBBatterVsPitcher"
-        
-        for batter in opposing_players:
-            querystring = {"playerID": pitcher_id, "playerRole": "", "opponent": batter['playerID']}
-            response = requests.get(url_matchup, headers=headers, params=querystring)
-            matchup_data = response.json()
-
-            if 'body' in matchup_data and 'opponents' in matchup_data['body']:
-                # Access the stats from the correct path in the JSON
-                stats = matchup_data['body']['opponents'][0]['stats'] if matchup_data['body']['opponents'] else {}
-                
-                matchup_table.add_row(
-                    batter['name'],
-                    str(stats.get('AB', '0')),
-                    str(stats.get('H', '0')),
-                    str(stats.get('2B', '0')),
-                    str(stats.get('3B', '0')),
-                    str(stats.get('HR', '0')),
-                    str(stats.get('RBI', '0')),
-                    str(stats.get('BB', '0')),
-                    str(stats.get('K', '0')),  
-                    str(stats.get('AVG', '.000'))
-                )
-
-        console.print(matchup_table)
+        # Get matchup stats for every opposing player at once
+        results = fetch_batter_vs_pitcher(pitcher_id, [batter.player_id for batter in opposing_players])
+
+        for batter, stats in zip(opposing_players, results):
+            if stats is None:
+                matchup_table.add_row(batter.name, *["-"] * 9)
+                continue
+
+            matchup_table.add_row(
+                batter.name,
+                str(stats.ab),
+                str(stats.h),
+                str(stats.doubles),
+                str(stats.triples),
+                str(stats.hr),
+                str(stats.rbi),
+                str(stats.bb),
+                str(stats.so),
+                format_avg(stats.avg)
+            )
+
+        with PROFILER.span("render.matchups", rows=len(opposing_players)):
+            console.print(matchup_table)
 
     except Exception as e:
         console.print(f"[red]Error fetching matchup data: {str(e)}[/red]")
-        console.print(f"[yellow]API Response: {matchup_data}[/yellow]")  # Debug info
 
-def get_player_stats(player_id, num_games):
-    """
-    Get detailed stats for a specific player by their ID.
-    """
-    url = "https://tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com/getMLBGamesForPlayer"
-    
+# ----- PLAYER STATS ------------------
+
+def fetch_game_log(player_id, num_games, season=None):
+    """Fetch a player's last num_games games as a list of GameLogEntry."""
+    # The warehouse can answer once it's up to date through yesterday
+    if WAREHOUSE.is_current():
+        with PROFILER.span("warehouse.read", query="game_log"):
+            games = WAREHOUSE.game_log(player_id, num_games, season or DEFAULT_SEASON)
+        if len(games) == num_games:
+            return games
+
     querystring = {
         "playerID": str(player_id),
         "numberOfGames": str(num_games),
-        "season": "2025"
+        "season": str(season or DEFAULT_SEASON)
     }
+    data = get_client().get_json("getMLBGamesForPlayer", params=querystring)
+    with PROFILER.span("parse.game_log"):
+        return parse_game_log(data.get('body'))
 
-    headers = {
-        "x-rapidapi-key": RAPIDAPI_KEY,
-        "x-rapidapi-host": "tank01-mlb-live-in-game-real-time-statistics.p.rapidapi.com"
-    }   
-
+def get_player_stats(player_id, num_games):
+    """
+    Get detailed stats for a specific player by their ID.
+    """
     try:
-        response = requests.get(url, headers=headers, params=querystring)
-        data = response.json()
-        
+        games = fetch_game_log(player_id, num_games)
+
         # Check if we have valid data
-        if not data.get('body'):
+        if not games:
             console.print("[red]No player stats found for the given ID[/red]")
             return None
-            
-        games_data = data['body']
-        
+
         # Create stats table
         table = Table(title=f"Player Stats for last {num_games} game(s)")
         table.add_column("Game Date", style="cyan", justify="center")
@@ -394,36 +594,38 @@ def get_player_stats(player_id, num_games):
         table.add_column("SO", justify="center")
         table.add_column("HR", justify="center", style="yellow")
         table.add_column("AVG", justify="center", style="green")
+        table.add_column("Cum AVG", justify="center", style="bold green")
+
+        # Running AVG from the earliest game shown up to each game
+        cumulative_avg = {}
+        hits = at_bats = 0
+        for game in sorted(games, key=lambda g: g.game_id):
+            hits += game.batting.h
+            at_bats += game.batting.ab
+            cumulative_avg[game.game_id] = hits / at_bats if at_bats else 0.0
 
         # Process each game's stats
-        for game_id, game_data in games_data.items():
-            if isinstance(game_data, dict):
-                hitting_stats = game_data.get('Hitting', {})
-                game_date = game_id.split('_')[0]  # Extract date from game_id
-                team = game_data.get('team', 'N/A')
-                position = game_data.get('startingPosition', 'N/A')
-                
-                # Color the team name
-                team_color = TEAM_COLORS.get(team, "#ffffff")
-                team_colored = f"[{team_color}]{team}[/]"
-                
-                table.add_row(
-                    game_date,
-                    team_colored,
-                    position,
-                    str(hitting_stats.get('AB', '0')),
-                    str(hitting_stats.get('H', '0')),
-                    str(hitting_stats.get('R', '0')),
-                    str(hitting_stats.get('RBI', '0')),
-                    str(hitting_stats.get('BB', '0')),
-                    str(hitting_stats.get('SO', '0')),
-                    str(hitting_stats.get('HR', '0')),
-                    str(hitting_stats.get('AVG', '.000'))
-                )
-
-        console.print(table)
-        return games_data
+        for game in games:
+            batting = game.batting
+            table.add_row(
+                game.date,
+                color_team(game.team),
+                game.position,
+                str(batting.ab),
+                str(batting.h),
+                str(batting.r),
+                str(batting.rbi),
+                str(batting.bb),
+                str(batting.so),
+                str(batting.hr),
+                format_avg(batting.avg),
+                format_avg(cumulative_avg[game.game_id])
+            )
+
+        with PROFILER.span("render.player_stats", rows=len(games)):
+            console.print(table)
+        return games
 
     except Exception as e:
         console.print(f"[red]Error fetching player stats: {str(e)}[/red]")
-        return None
\ No newline at end of file
+        return None
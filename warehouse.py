@@ -0,0 +1,275 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime, timedelta
+
+from models import GameLogEntry, ScoreboardGame, parse_batting, parse_box_score
+from roster_cache import CACHE_DIR
+
+WAREHOUSE_PATH = os.getenv('WAREHOUSE_PATH', os.path.join(CACHE_DIR, 'warehouse.sqlite'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id     TEXT PRIMARY KEY,
+    game_date   TEXT NOT NULL,
+    away        TEXT NOT NULL,
+    home        TEXT NOT NULL,
+    status_code TEXT,
+    away_runs   INTEGER,
+    home_runs   INTEGER,
+    venue       TEXT,
+    attendance  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_games_date ON games (game_date);
+
+CREATE TABLE IF NOT EXISTS box_scores (
+    game_id TEXT PRIMARY KEY REFERENCES games (game_id),
+    payload BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS line_scores (
+    game_id TEXT NOT NULL REFERENCES games (game_id),
+    team    TEXT NOT NULL,
+    inning  INTEGER NOT NULL,
+    runs    TEXT,
+    PRIMARY KEY (game_id, team, inning)
+);
+
+CREATE TABLE IF NOT EXISTS team_stats (
+    game_id TEXT NOT NULL REFERENCES games (game_id),
+    team    TEXT NOT NULL,
+    ab INTEGER, h INTEGER, r INTEGER, rbi INTEGER, bb INTEGER, so INTEGER, hr INTEGER,
+    p_outs INTEGER, p_h INTEGER, p_r INTEGER, p_er INTEGER, p_bb INTEGER, p_so INTEGER, p_hr INTEGER,
+    pitches INTEGER, sb INTEGER, cs INTEGER, errors INTEGER,
+    PRIMARY KEY (game_id, team)
+);
+
+CREATE TABLE IF NOT EXISTS player_lines (
+    game_id   TEXT NOT NULL REFERENCES games (game_id),
+    game_date TEXT NOT NULL,
+    player_id TEXT NOT NULL,
+    team      TEXT,
+    name      TEXT,
+    position  TEXT,
+    batted    INTEGER NOT NULL,
+    ab INTEGER, h INTEGER, r INTEGER, rbi INTEGER, bb INTEGER, so INTEGER, hr INTEGER,
+    doubles INTEGER, triples INTEGER, hbp INTEGER, sf INTEGER, sb INTEGER, cs INTEGER,
+    pitched INTEGER NOT NULL,
+    p_outs INTEGER, p_h INTEGER, p_r INTEGER, p_er INTEGER, p_bb INTEGER, p_so INTEGER, p_hr INTEGER,
+    pitches INTEGER, win INTEGER, loss INTEGER, save INTEGER,
+    fantasy_points REAL,
+    PRIMARY KEY (game_id, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_player_lines_player ON player_lines (player_id, game_date);
+CREATE INDEX IF NOT EXISTS idx_player_lines_date ON player_lines (game_date);
+
+CREATE TABLE IF NOT EXISTS ingested_dates (
+    game_date TEXT PRIMARY KEY
+);
+"""
+
+BATTING_COLUMNS = ('ab', 'h', 'r', 'rbi', 'bb', 'so', 'hr', 'doubles', 'triples', 'hbp', 'sf', 'sb', 'cs')
+PITCHING_COLUMNS = ('outs', 'h', 'r', 'er', 'bb', 'so', 'hr', 'pitches', 'win', 'loss', 'save')
+
+
+def _batting_values(batting):
+    return [getattr(batting, stat) if batting else 0 for stat in BATTING_COLUMNS]
+
+
+def _pitching_values(pitching):
+    return [getattr(pitching, stat) if pitching else 0 for stat in PITCHING_COLUMNS]
+
+
+class Warehouse:
+    """
+    Local SQLite store of Final games: box scores, line scores, team stats and
+    player lines, plus which dates have been fully ingested. The database is
+    only created once something is written to it.
+    """
+
+    def __init__(self, path=WAREHOUSE_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def exists(self):
+        return self._conn is not None or os.path.exists(self.path)
+
+    def connect(self):
+        with self._lock:
+            if self._conn is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+                self._conn.row_factory = sqlite3.Row
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.executescript(SCHEMA)
+            return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _query(self, sql, params=()):
+        if not self.exists():
+            return []
+        with self._lock:
+            return self.connect().execute(sql, params).fetchall()
+
+    # ----- WRITING ------------------
+
+    def store_box_score(self, game_id, game_date, body):
+        """Store one Final box score (the body of a getMLBBoxScore response)."""
+        box = parse_box_score(body, game_id)
+        if box is None or not box.game_id:
+            return None
+
+        with self._lock:
+            conn = self.connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (box.game_id, game_date, box.away, box.home, box.status_code,
+                     box.away_line.runs, box.home_line.runs, box.venue, box.attendance)
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO box_scores VALUES (?, ?)",
+                    (box.game_id, zlib.compress(json.dumps(body, separators=(',', ':')).encode('utf-8')))
+                )
+                conn.execute("DELETE FROM line_scores WHERE game_id = ?", (box.game_id,))
+                conn.executemany(
+                    "INSERT INTO line_scores VALUES (?, ?, ?, ?)",
+                    [(box.game_id, line.team, inning, runs)
+                     for line in (box.away_line, box.home_line)
+                     for inning, runs in enumerate(line.innings, 1)]
+                )
+                for team, stats in ((box.away, box.away_stats), (box.home, box.home_stats)):
+                    if stats is None:
+                        continue
+                    b, p = stats.batting, stats.pitching
+                    conn.execute(
+                        "INSERT OR REPLACE INTO team_stats VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (box.game_id, team, b.ab, b.h, b.r, b.rbi, b.bb, b.so, b.hr,
+                         p.outs, p.h, p.r, p.er, p.bb, p.so, p.hr, p.pitches, b.sb, b.cs, stats.errors)
+                    )
+                conn.execute("DELETE FROM player_lines WHERE game_id = ?", (box.game_id,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO player_lines VALUES (" + ', '.join(['?'] * 33) + ")",
+                    [(box.game_id, game_date, player.player_id, player.team, player.name, player.position,
+                      int(player.batting is not None), *_batting_values(player.batting),
+                      int(player.pitching is not None), *_pitching_values(player.pitching),
+                      player.fantasy_points)
+                     for player in box.players if player.player_id]
+                )
+        return box
+
+    def mark_date_ingested(self, game_date):
+        with self._lock:
+            conn = self.connect()
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO ingested_dates VALUES (?)", (game_date,))
+
+    # ----- READING ------------------
+
+    def has_game(self, game_id):
+        return bool(self._query("SELECT 1 FROM box_scores WHERE game_id = ?", (game_id,)))
+
+    def is_date_ingested(self, game_date):
+        return bool(self._query("SELECT 1 FROM ingested_dates WHERE game_date = ?", (game_date,)))
+
+    def first_missing_date(self):
+        """
+        The first day not ingested since the oldest ingested one, so every day
+        before it (back to the oldest) is in the warehouse. None while empty.
+        """
+        dates = self.ingested_dates()
+        if not dates:
+            return None
+        day = datetime.strptime(dates[0], "%Y%m%d")
+        for game_date in dates:
+            if game_date != day.strftime("%Y%m%d"):
+                break
+            day += timedelta(days=1)
+        return day.strftime("%Y%m%d")
+
+    def is_current(self):
+        """True when every day up to yesterday has been ingested, without gaps."""
+        missing = self.first_missing_date()
+        return bool(missing) and missing >= date.today().strftime("%Y%m%d")
+
+    def data_version(self):
+        """Changes whenever games are added, for caches built from the warehouse."""
+        rows = self._query("SELECT COUNT(*), MAX(game_date) FROM games")
+        return tuple(rows[0]) if rows else (0, None)
+
+    def player_lines(self, columns, role='batted'):
+        """
+        Every batting (role='batted') or pitching (role='pitched') line as
+        (player_id, name, team, game_date, *columns) tuples, ordered by player then date.
+        """
+        if role not in ('batted', 'pitched'):
+            raise ValueError(f"Unknown role '{role}'")
+        sql = (f"SELECT player_id, name, team, game_date, {', '.join(columns)} FROM player_lines "
+               f"WHERE {role} = 1 ORDER BY player_id, game_date")
+        return [tuple(row) for row in self._query(sql)]
+
+    def ingested_dates(self, start_date=None, end_date=None):
+        """Fully ingested dates between start_date and end_date (inclusive), oldest first."""
+        rows = self._query(
+            "SELECT game_date FROM ingested_dates WHERE game_date >= ? AND game_date <= ? ORDER BY game_date",
+            (start_date or '', end_date or '99999999')
+        )
+        return [row[0] for row in rows]
+
+    def player_lines_on(self, game_date, columns):
+        """
+        Every player line from one date as (player_id, name, team, game_id,
+        batted, pitched, *columns) tuples.
+        """
+        sql = (f"SELECT player_id, name, team, game_id, batted, pitched, {', '.join(columns)} "
+               "FROM player_lines WHERE game_date = ?")
+        return [tuple(row) for row in self._query(sql, (game_date,))]
+
+    def box_score_body(self, game_id):
+        rows = self._query("SELECT payload FROM box_scores WHERE game_id = ?", (game_id,))
+        if not rows:
+            return None
+        return json.loads(zlib.decompress(rows[0][0]).decode('utf-8'))
+
+    def scoreboard(self, game_date):
+        """ScoreboardGames for a fully ingested date, or None if the date isn't in the warehouse."""
+        if not self.is_date_ingested(game_date):
+            return None
+        rows = self._query(
+            "SELECT game_id, away, home, away_runs, home_runs, status_code FROM games "
+            "WHERE game_date = ? ORDER BY game_id", (game_date,)
+        )
+        return [ScoreboardGame(game_id=row['game_id'], away=row['away'], home=row['home'],
+                               away_runs=row['away_runs'], home_runs=row['home_runs'],
+                               status_code=row['status_code'])
+                for row in rows]
+
+    def game_log(self, player_id, num_games, season=None):
+        """A player's last num_games batting lines as GameLogEntry models, newest first."""
+        sql = ("SELECT * FROM player_lines WHERE player_id = ? AND batted = 1"
+               + (" AND game_date LIKE ?" if season else "")
+               + " ORDER BY game_date DESC, game_id DESC LIMIT ?")
+        params = (str(player_id),) + ((f"{season}%",) if season else ()) + (num_games,)
+        return [
+            GameLogEntry(
+                game_id=row['game_id'],
+                date=row['game_date'],
+                team=row['team'] or 'N/A',
+                position=row['position'] or 'N/A',
+                batting=parse_batting({
+                    'AB': row['ab'], 'H': row['h'], 'R': row['r'], 'RBI': row['rbi'], 'BB': row['bb'],
+                    'SO': row['so'], 'HR': row['hr'], '2B': row['doubles'], '3B': row['triples'],
+                    'HBP': row['hbp'], 'SF': row['sf']
+                }, {'SB': row['sb'], 'CS': row['cs']})
+            )
+            for row in self._query(sql, params)
+        ]